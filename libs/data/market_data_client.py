@@ -12,13 +12,15 @@ import numpy as np
 from datetime import datetime, timedelta
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import time
 from dataclasses import dataclass
 from enum import Enum
 
-# Add project root to path
+# Add project root to path (only when not already importable as a package)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if 'libs' not in sys.modules and str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 try:
     from config import get_config
@@ -69,6 +71,12 @@ class MarketDataProvider:
         # Rate limiting
         self._last_request_time = 0
         
+        # Pooled HTTP session so repeated API calls reuse TCP/TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
     def _get_default_config(self) -> MarketDataConfig:
         """Get default market data configuration."""
         app_config = get_config()
@@ -179,7 +187,7 @@ class MarketDataProvider:
             'apikey': api_key
         }
         
-        response = requests.get(url, params=params, timeout=30)
+        response = self.session.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -349,6 +357,11 @@ class MarketDataProvider:
                              if pd.notnull(latest_row['open_price']) and latest_row['open_price'] != 0 else 0,
             'volume': int(latest_row['volume']) if pd.notnull(latest_row['volume']) else 0
         }
+    
+    def close(self):
+        """Close pooled HTTP connections."""
+        self.session.close()
+        logger.info("Market data HTTP session closed")
 
 
 # Global instance
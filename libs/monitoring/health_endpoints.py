@@ -12,9 +12,10 @@ from pathlib import Path
 from typing import Dict, Any
 import asyncio
 
-# Add project root to path
+# Add project root to path (only when not already importable as a package)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if 'libs' not in sys.modules and str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 try:
     from libs.monitoring import get_health_checker
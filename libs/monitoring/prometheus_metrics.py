@@ -15,9 +15,10 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
-# Add project root to path
+# Add project root to path (only when not already importable as a package)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if 'libs' not in sys.modules and str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 try:
     from prometheus_client import Counter, Histogram, Gauge, Info, generate_latest, CollectorRegistry, CONTENT_TYPE_LATEST
@@ -348,6 +349,27 @@ class PrometheusMetricsCollector:
         self.http_requests_total.labels(method=method, endpoint=endpoint, status_code=status_code).inc()
         self.http_request_duration.labels(method=method, endpoint=endpoint).observe(duration)
     
+    def record_http_request_batch(self, methods: List[str], endpoints: List[str],
+                                  status_codes: List[int], durations: List[float]):
+        """Record many HTTP requests, resolving each label set's children once."""
+        request_counts = defaultdict(int)
+        duration_children = {}
+        
+        with self._lock:
+            for method, endpoint, status_code, duration in zip(methods, endpoints, status_codes, durations):
+                request_counts[(method, endpoint, status_code)] += 1
+                
+                child = duration_children.get((method, endpoint))
+                if child is None:
+                    child = duration_children[(method, endpoint)] = self.http_request_duration.labels(
+                        method=method, endpoint=endpoint
+                    )
+                child.observe(duration)
+            
+            # One counter increment per distinct label set
+            for (method, endpoint, status_code), count in request_counts.items():
+                self.http_requests_total.labels(method=method, endpoint=endpoint, status_code=status_code).inc(count)
+    
     def record_error(self, error_type: str, component: str):
         """Record error metrics."""
         self.errors_total.labels(type=error_type, component=component).inc()
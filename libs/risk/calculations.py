@@ -3,9 +3,10 @@ Real Risk Calculation Engine
 Replaces mock implementations with actual financial risk calculations
 """
 
+import math
+import os
 import numpy as np
 import pandas as pd
-import scipy.stats as stats
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timedelta
 import logging
@@ -22,12 +23,214 @@ except ImportError:
     log_user_action = lambda *args, **kwargs: None
     get_metrics_collector = lambda: None
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; the NumPy kernels below are used without it
+    njit = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
+# Annualization constants
+_TRADING_DAYS = 252
+_SQRT_252 = math.sqrt(252.0)
+
+
+def _returns_array(returns) -> np.ndarray:
+    """Unwrap a returns series to a float64 array with NaNs dropped."""
+    arr = np.asarray(returns, dtype=np.float64)
+    return arr[~np.isnan(arr)]
+
+
+def _aligned_arrays(left, right) -> Tuple[np.ndarray, np.ndarray]:
+    """Inner-join two return series on their index and drop rows with a NaN."""
+    if isinstance(left, pd.Series) and isinstance(right, pd.Series) and not left.index.equals(right.index):
+        left, right = left.align(right, join='inner')
+    
+    a = np.asarray(left, dtype=np.float64)
+    b = np.asarray(right, dtype=np.float64)
+    mask = ~(np.isnan(a) | np.isnan(b))
+    return a[mask], b[mask]
+
+
+def _partitioned_quantiles(returns: np.ndarray, quantiles: Tuple[float, ...]) -> Tuple[List[float], np.ndarray]:
+    """
+    Linearly interpolated quantiles of a non-empty array, matching np.percentile's
+    default, found with one partial sort. The partitioned copy is returned too
+    so callers can scan the tail without sorting again.
+    """
+    last = returns.size - 1
+    bounds = []
+    for q in quantiles:
+        position = q * last
+        lower = int(position)
+        bounds.append((position, lower, min(lower + 1, last)))
+    
+    partitioned = np.partition(returns, sorted({k for _, lower, upper in bounds for k in (lower, upper)}))
+    
+    values = []
+    for position, lower, upper in bounds:
+        low_value = partitioned[lower]
+        values.append(float(low_value + (position - lower) * (partitioned[upper] - low_value)))
+    return values, partitioned
+
+
+def _max_drawdown_np(returns: np.ndarray) -> float:
+    """Maximum drawdown of a NaN-free returns array using NumPy scans."""
+    cumulative_returns = np.cumprod(1.0 + returns)
+    running_max = np.maximum.accumulate(cumulative_returns)
+    return float(((running_max - cumulative_returns) / running_max).max())
+
+
+def _summary_np(returns: np.ndarray) -> Tuple[float, float, float]:
+    """Mean, sum of squared deviations and max drawdown of a NaN-free returns array."""
+    mean = float(returns.mean())
+    return mean, float(np.square(returns - mean).sum()), _max_drawdown_np(returns)
+
+
+def _summary_loop(returns):
+    """
+    Mean, sum of squared deviations (Welford) and max drawdown of a non-empty,
+    NaN-free returns array in a single pass.
+    """
+    mean = returns[0]
+    m2 = 0.0
+    cumulative = 1.0 + returns[0]
+    peak = cumulative
+    max_dd = 0.0
+    for i in range(1, returns.shape[0]):
+        x = returns[i]
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+        cumulative *= 1.0 + x
+        if cumulative > peak:
+            peak = cumulative
+        drawdown = (peak - cumulative) / peak
+        if drawdown > max_dd:
+            max_dd = drawdown
+    return mean, m2, max_dd
+
+
+def _co_moments_np(portfolio: np.ndarray, market: np.ndarray) -> Tuple[float, float]:
+    """Sum of cross deviations and sum of squared market deviations."""
+    market_dev = market - market.mean()
+    return float(np.dot(portfolio - portfolio.mean(), market_dev)), float(np.dot(market_dev, market_dev))
+
+
+def _co_moments_loop(portfolio, market):
+    """
+    Sum of cross deviations and sum of squared market deviations of two aligned,
+    NaN-free arrays, without materialising the demeaned copies.
+    """
+    n = portfolio.shape[0]
+    sum_p = 0.0
+    sum_m = 0.0
+    for i in range(n):
+        sum_p += portfolio[i]
+        sum_m += market[i]
+    mean_p = sum_p / n
+    mean_m = sum_m / n
+    
+    cross = 0.0
+    squares = 0.0
+    for i in range(n):
+        market_dev = market[i] - mean_m
+        cross += (portfolio[i] - mean_p) * market_dev
+        squares += market_dev * market_dev
+    return cross, squares
+
+
+def _stress_drawdowns_np(returns: np.ndarray, scales: np.ndarray, dtype: Any = np.float64) -> np.ndarray:
+    """Max drawdown of returns * scale for every scale, via a scales x observations matrix."""
+    shocked = scales.astype(dtype)[:, None] * returns.astype(dtype)[None, :]
+    cumulative_returns = np.cumprod(1.0 + shocked, axis=1)
+    running_max = np.maximum.accumulate(cumulative_returns, axis=1)
+    return ((running_max - cumulative_returns) / running_max).max(axis=1)
+
+
+def _stress_drawdowns_loop(returns, scales):
+    """
+    Max drawdown of returns * scale for every scale, one independent pass per
+    scale without materialising the shocked matrix. Runs serially: there are only
+    a handful of scales, and a parallel kernel would start numba's threading layer
+    at import, which is not fork-safe for the process-pool callers.
+    """
+    max_dds = np.empty(scales.shape[0])
+    for s in range(scales.shape[0]):
+        scale = scales[s]
+        cumulative = 1.0 + scale * returns[0]
+        peak = cumulative
+        max_dd = 0.0
+        for i in range(1, returns.shape[0]):
+            cumulative *= 1.0 + scale * returns[i]
+            if cumulative > peak:
+                peak = cumulative
+            drawdown = (peak - cumulative) / peak
+            if drawdown > max_dd:
+                max_dd = drawdown
+        max_dds[s] = max_dd
+    return max_dds
+
+
+def _max_drawdown_loop(returns):
+    """Maximum drawdown of a non-empty, NaN-free returns array in a single pass."""
+    cumulative = 1.0 + returns[0]
+    peak = cumulative
+    max_dd = 0.0
+    for i in range(1, returns.shape[0]):
+        cumulative *= 1.0 + returns[i]
+        if cumulative > peak:
+            peak = cumulative
+        drawdown = (peak - cumulative) / peak
+        if drawdown > max_dd:
+            max_dd = drawdown
+    return max_dd
+
+
+# Kernel signatures; every caller hands over NaN-free float64 arrays
+_NUMBA_SIGNATURES = {
+    '_max_drawdown_loop': 'float64(float64[:])',
+    '_summary_loop': 'UniTuple(float64, 3)(float64[:])',
+    '_co_moments_loop': 'UniTuple(float64, 2)(float64[:], float64[:])',
+    '_stress_drawdowns_loop': 'float64[:](float64[:], float64[:])',
+}
+
+
+def _jit(kernel):
+    """
+    Compile a kernel with numba. With explicit signatures (the default) it is
+    compiled, or loaded from the on-disk cache, at import so no test or request
+    pays for type inference; RISK_NUMBA_WARMUP=0 defers compilation to first use.
+    """
+    if os.environ.get('RISK_NUMBA_WARMUP', '1') == '0':
+        return njit(cache=True, nogil=True)(kernel)
+    return njit(_NUMBA_SIGNATURES[kernel.__name__], cache=True, nogil=True)(kernel)
+
+
+if njit is not None:
+    _max_drawdown_nb = _jit(_max_drawdown_loop)
+    _summary_nb = _jit(_summary_loop)
+    _co_moments_nb = _jit(_co_moments_loop)
+    _stress_drawdowns_nb = _jit(_stress_drawdowns_loop)
+    _max_drawdown = lambda returns: float(_max_drawdown_nb(returns))
+    _summary = lambda returns: tuple(float(value) for value in _summary_nb(returns))
+    _co_moments = lambda portfolio, market: tuple(float(value) for value in _co_moments_nb(portfolio, market))
+    # The compiled kernel is float64-only; other precisions take the NumPy matrix path
+    _stress_drawdowns = lambda returns, scales, dtype=np.float64: (
+        _stress_drawdowns_nb(returns, scales) if np.dtype(dtype) == np.float64
+        else _stress_drawdowns_np(returns, scales, dtype)
+    )
+else:
+    _max_drawdown = _max_drawdown_np
+    _summary = _summary_np
+    _co_moments = _co_moments_np
+    _stress_drawdowns = _stress_drawdowns_np
+
 
 class RiskMetric(Enum):
     """Risk metric types."""
@@ -64,8 +267,11 @@ class RiskResults:
 class RiskCalculationEngine:
     """Advanced risk calculation engine with real financial models."""
     
-    def __init__(self, risk_free_rate: float = 0.02):
+    def __init__(self, risk_free_rate: float = 0.02, dtype: Any = np.float64):
         self.risk_free_rate = risk_free_rate
+        # Precision of the stress-test drawdown pass; float32 runs as a NumPy matrix
+        # with half the memory traffic, float64 uses the numba kernel when available
+        self.dtype = np.dtype(dtype)
         self.metrics_collector = get_metrics_collector()
         
     def calculate_returns(self, prices: pd.Series, method: str = 'simple') -> pd.Series:
@@ -76,7 +282,9 @@ class RiskCalculationEngine:
         if method == 'simple':
             returns = prices.pct_change().dropna()
         elif method == 'log':
-            returns = np.log(prices / prices.shift(1)).dropna()
+            # Difference of logs: one log pass and one diff pass, no shifted copy
+            log_prices = np.log(prices.to_numpy(dtype=np.float64))
+            returns = pd.Series(np.diff(log_prices), index=prices.index[1:], name=prices.name).dropna()
         else:
             raise ValueError(f"Unknown return calculation method: {method}")
         
@@ -84,7 +292,13 @@ class RiskCalculationEngine:
     
     def calculate_portfolio_returns(self, positions: pd.DataFrame, 
                                   price_data: pd.DataFrame) -> pd.Series:
-        """Calculate portfolio returns based on positions and price data."""
+        """
+        Calculate portfolio returns based on positions and price data.
+        
+        price_data is either long format (trading_date, symbol, close_price rows)
+        or an already pivoted close-price matrix indexed by date with one column
+        per symbol, which skips the pivot.
+        """
         try:
             # Ensure we have required columns
             required_pos_cols = ['symbol', 'quantity', 'weight']
@@ -93,37 +307,40 @@ class RiskCalculationEngine:
             if not all(col in positions.columns for col in required_pos_cols):
                 raise ValueError(f"Position data missing required columns: {required_pos_cols}")
             
-            if not all(col in price_data.columns for col in required_price_cols):
+            if isinstance(price_data.index, pd.DatetimeIndex) and 'symbol' not in price_data.columns:
+                # Pre-pivoted close-price matrix
+                price_pivot = price_data.sort_index()
+            elif all(col in price_data.columns for col in required_price_cols):
+                # Pivot price data to have symbols as columns
+                price_pivot = price_data.pivot(index='trading_date', columns='symbol', values='close_price')
+                price_pivot = price_pivot.sort_index()
+            else:
                 raise ValueError(f"Price data missing required columns: {required_price_cols}")
             
-            # Pivot price data to have symbols as columns
-            price_pivot = price_data.pivot(index='trading_date', columns='symbol', values='close_price')
-            price_pivot = price_pivot.sort_index()
-            
             # Calculate individual asset returns
             asset_returns = price_pivot.pct_change().dropna()
             
-            # Get weights for assets in our portfolio
+            # Get weights for assets in our portfolio, aligned to the return columns
             weights = positions.set_index('symbol')['weight'].to_dict()
+            held = [symbol in weights for symbol in asset_returns.columns]
+            weight_vector = np.array(
+                [weights[symbol] if is_held else 0.0 for symbol, is_held in zip(asset_returns.columns, held)],
+                dtype=np.float64
+            )
             
-            # Calculate portfolio returns
-            portfolio_returns = pd.Series(index=asset_returns.index, dtype=float)
+            # dropna() above leaves every date with the same symbols, so one
+            # total weight normalizes all rows
+            total_weight = weight_vector[held].sum() if any(held) else 0.0
             
-            for date, returns_row in asset_returns.iterrows():
-                weighted_return = 0.0
-                total_weight = 0.0
-                
-                for symbol, return_val in returns_row.items():
-                    if symbol in weights and not pd.isna(return_val):
-                        weight = weights[symbol]
-                        weighted_return += weight * return_val
-                        total_weight += weight
-                
-                # Normalize if total weight != 1
-                if total_weight > 0:
-                    portfolio_returns.loc[date] = weighted_return / total_weight if total_weight != 1 else weighted_return
-                else:
-                    portfolio_returns.loc[date] = 0.0
+            # Calculate portfolio returns as one matrix-vector product
+            if total_weight > 0:
+                weighted_returns = asset_returns.to_numpy(dtype=np.float64) @ weight_vector
+                if total_weight != 1:
+                    weighted_returns = weighted_returns / total_weight
+            else:
+                weighted_returns = np.zeros(len(asset_returns))
+            
+            portfolio_returns = pd.Series(weighted_returns, index=asset_returns.index, dtype=float)
             
             return portfolio_returns.dropna()
             
@@ -137,12 +354,12 @@ class RiskCalculationEngine:
             return 0.0
         
         try:
-            # Sort returns in ascending order
-            sorted_returns = returns.sort_values()
+            arr = _returns_array(returns)
+            if arr.size == 0:
+                return 0.0
             
-            # Calculate percentile
-            percentile = (1 - confidence_level) * 100
-            var_value = np.percentile(sorted_returns, percentile)
+            # Loss quantile of the return distribution
+            (var_value,), _ = _partitioned_quantiles(arr, (1 - confidence_level,))
             
             # VaR is typically reported as a positive number
             return abs(var_value)
@@ -151,22 +368,46 @@ class RiskCalculationEngine:
             logger.error(f"Error calculating VaR: {e}")
             return 0.0
     
+    def calculate_var_levels(self, returns: pd.Series,
+                             confidence_levels: Tuple[float, ...] = (0.95, 0.99, 0.995)) -> Dict[float, float]:
+        """Calculate Value at Risk at several confidence levels from one partial sort."""
+        if len(returns) == 0:
+            return dict.fromkeys(confidence_levels, 0.0)
+        
+        try:
+            arr = _returns_array(returns)
+            if arr.size == 0:
+                return dict.fromkeys(confidence_levels, 0.0)
+            
+            quantiles, _ = _partitioned_quantiles(arr, tuple(1 - level for level in confidence_levels))
+            return {level: abs(value) for level, value in zip(confidence_levels, quantiles)}
+            
+        except Exception as e:
+            logger.error(f"Error calculating VaR levels: {e}")
+            return dict.fromkeys(confidence_levels, 0.0)
+    
     def calculate_expected_shortfall(self, returns: pd.Series, confidence_level: float = 0.95) -> float:
         """Calculate Expected Shortfall (Conditional VaR)."""
         if len(returns) == 0:
             return 0.0
         
         try:
-            var_value = self.calculate_var(returns, confidence_level)
+            arr = _returns_array(returns)
+            if arr.size == 0:
+                return 0.0
+            
+            # One partition yields both the VaR and the tail to average
+            (quantile,), partitioned = _partitioned_quantiles(arr, (1 - confidence_level,))
+            var_value = abs(quantile)
             
             # Get returns worse than VaR
-            tail_returns = returns[returns <= -var_value]
+            tail_returns = partitioned[partitioned <= -var_value]
             
-            if len(tail_returns) == 0:
+            if tail_returns.size == 0:
                 return var_value
             
             # Expected Shortfall is the mean of tail losses
-            expected_shortfall = abs(tail_returns.mean())
+            expected_shortfall = abs(float(tail_returns.mean()))
             
             return expected_shortfall
             
@@ -180,11 +421,12 @@ class RiskCalculationEngine:
             return 0.0
         
         try:
-            vol = returns.std()
+            arr = _returns_array(returns)
+            vol = float(arr.std(ddof=1))
             
             # Annualize assuming 252 trading days
             if annualize:
-                vol = vol * np.sqrt(252)
+                vol = vol * _SQRT_252
             
             return vol
             
@@ -200,9 +442,11 @@ class RiskCalculationEngine:
         try:
             risk_free = risk_free_rate or self.risk_free_rate
             
+            arr = _returns_array(returns)
+            
             # Annualize returns
-            annual_return = returns.mean() * 252
-            annual_volatility = self.calculate_volatility(returns, annualize=True)
+            annual_return = float(arr.mean()) * _TRADING_DAYS
+            annual_volatility = self.calculate_volatility(arr, annualize=True)
             
             if annual_volatility == 0:
                 return 0.0
@@ -221,19 +465,12 @@ class RiskCalculationEngine:
             return 0.0
         
         try:
-            # Calculate cumulative returns
-            cumulative_returns = (1 + returns).cumprod()
-            
-            # Calculate running maximum
-            running_max = cumulative_returns.expanding().max()
-            
-            # Calculate drawdown
-            drawdown = (cumulative_returns - running_max) / running_max
-            
-            # Maximum drawdown is the minimum (most negative) drawdown
-            max_dd = abs(drawdown.min())
+            arr = _returns_array(returns)
+            if arr.size == 0:
+                return 0.0
             
-            return max_dd
+            # Largest peak-to-trough fall of the cumulative return path
+            return _max_drawdown(arr)
             
         except Exception as e:
             logger.error(f"Error calculating max drawdown: {e}")
@@ -247,22 +484,18 @@ class RiskCalculationEngine:
         
         try:
             # Align the series by date
-            aligned_data = pd.DataFrame({
-                'portfolio': portfolio_returns,
-                'market': market_returns
-            }).dropna()
+            portfolio, market = _aligned_arrays(portfolio_returns, market_returns)
             
-            if len(aligned_data) < 2:
+            if portfolio.size < 2:
                 return 1.0
             
-            # Calculate covariance and variance
-            covariance = np.cov(aligned_data['portfolio'], aligned_data['market'])[0, 1]
-            market_variance = np.var(aligned_data['market'])
+            # Covariance over market variance; the (n - 1) divisors cancel
+            cross, market_squares = _co_moments(portfolio, market)
             
-            if market_variance == 0:
+            if market_squares == 0:
                 return 1.0
             
-            beta = covariance / market_variance
+            beta = cross / market_squares
             
             return beta
             
@@ -282,8 +515,8 @@ class RiskCalculationEngine:
                 beta = self.calculate_beta(portfolio_returns, market_returns)
             
             # Annualize returns
-            portfolio_annual_return = portfolio_returns.mean() * 252
-            market_annual_return = market_returns.mean() * 252
+            portfolio_annual_return = float(_returns_array(portfolio_returns).mean()) * _TRADING_DAYS
+            market_annual_return = float(_returns_array(market_returns).mean()) * _TRADING_DAYS
             
             # Alpha = Portfolio Return - (Risk Free Rate + Beta * (Market Return - Risk Free Rate))
             alpha = portfolio_annual_return - (self.risk_free_rate + beta * (market_annual_return - self.risk_free_rate))
@@ -302,19 +535,16 @@ class RiskCalculationEngine:
         
         try:
             # Align the series
-            aligned_data = pd.DataFrame({
-                'portfolio': portfolio_returns,
-                'benchmark': benchmark_returns
-            }).dropna()
+            portfolio, benchmark = _aligned_arrays(portfolio_returns, benchmark_returns)
             
-            if len(aligned_data) < 2:
+            if portfolio.size < 2:
                 return 0.0
             
             # Calculate excess returns
-            excess_returns = aligned_data['portfolio'] - aligned_data['benchmark']
+            excess_returns = portfolio - benchmark
             
             # Tracking error is annualized standard deviation of excess returns
-            tracking_error = excess_returns.std() * np.sqrt(252)
+            tracking_error = float(excess_returns.std(ddof=1)) * _SQRT_252
             
             return tracking_error
             
@@ -342,7 +572,7 @@ class RiskCalculationEngine:
             excess_returns = aligned_data['portfolio'] - aligned_data['benchmark']
             
             # Information ratio = mean excess return / tracking error
-            mean_excess_return = excess_returns.mean() * 252  # Annualize
+            mean_excess_return = excess_returns.mean() * _TRADING_DAYS  # Annualize
             tracking_error = self.calculate_tracking_error(portfolio_returns, benchmark_returns)
             
             if tracking_error == 0:
@@ -358,9 +588,20 @@ class RiskCalculationEngine:
     
     def calculate_all_risk_metrics(self, portfolio_id: str, positions: pd.DataFrame,
                                  price_data: pd.DataFrame, 
-                                 market_data: pd.DataFrame = None) -> RiskResults:
-        """Calculate all risk metrics for a portfolio."""
+                                 market_data: pd.DataFrame = None,
+                                 as_of: datetime = None) -> RiskResults:
+        """
+        Calculate all risk metrics for a portfolio.
+        
+        as_of stamps the results' calculation_date; batch callers pass one
+        shared timestamp, otherwise the start of this call is used.
+        """
         start_time = datetime.utcnow()
+        calculation_date = as_of or start_time
+        
+        if positions.empty or price_data.empty:
+            logger.warning(f"No positions or price data for {portfolio_id}")
+            return self._create_empty_results(portfolio_id, calculation_date)
         
         try:
             # Calculate portfolio returns
@@ -368,15 +609,16 @@ class RiskCalculationEngine:
             
             if len(portfolio_returns) == 0:
                 logger.warning(f"No portfolio returns calculated for {portfolio_id}")
-                return self._create_empty_results(portfolio_id)
+                return self._create_empty_results(portfolio_id, calculation_date)
             
             # Calculate basic risk metrics
-            var_95 = self.calculate_var(portfolio_returns, 0.95)
-            var_99 = self.calculate_var(portfolio_returns, 0.99)
-            expected_shortfall = self.calculate_expected_shortfall(portfolio_returns, 0.95)
-            volatility = self.calculate_volatility(portfolio_returns)
-            sharpe_ratio = self.calculate_sharpe_ratio(portfolio_returns)
-            max_drawdown = self.calculate_max_drawdown(portfolio_returns)
+            metrics = self._compute_all_scalar_metrics(portfolio_returns.to_numpy(dtype=np.float64))
+            var_95 = metrics['var_95']
+            var_99 = metrics['var_99']
+            expected_shortfall = metrics['expected_shortfall']
+            volatility = metrics['volatility']
+            sharpe_ratio = metrics['sharpe_ratio']
+            max_drawdown = metrics['max_drawdown']
             
             # Calculate market-relative metrics if market data available
             beta = 1.0
@@ -395,7 +637,7 @@ class RiskCalculationEngine:
             # Create results
             results = RiskResults(
                 portfolio_id=portfolio_id,
-                calculation_date=datetime.utcnow(),
+                calculation_date=calculation_date,
                 var_95=var_95,
                 var_99=var_99,
                 expected_shortfall=expected_shortfall,
@@ -427,13 +669,43 @@ class RiskCalculationEngine:
             
         except Exception as e:
             logger.error(f"Error calculating risk metrics for portfolio {portfolio_id}: {e}")
-            return self._create_empty_results(portfolio_id)
+            return self._create_empty_results(portfolio_id, calculation_date)
     
-    def _create_empty_results(self, portfolio_id: str) -> RiskResults:
+    def _compute_all_scalar_metrics(self, returns: np.ndarray) -> Dict[str, float]:
+        """
+        VaR, Expected Shortfall, volatility, Sharpe ratio and max drawdown from a
+        single partition and a single scan of the returns; agrees with the
+        individual calculate_* methods up to floating-point rounding.
+        """
+        arr = returns[~np.isnan(returns)]
+        if arr.size == 0:
+            return dict.fromkeys(
+                ('var_95', 'var_99', 'expected_shortfall', 'volatility', 'sharpe_ratio', 'max_drawdown'), 0.0
+            )
+        
+        (q95, q99), partitioned = _partitioned_quantiles(arr, (1 - 0.95, 1 - 0.99))
+        var_95 = abs(q95)
+        tail_returns = partitioned[partitioned <= -var_95]
+        expected_shortfall = abs(float(tail_returns.mean())) if tail_returns.size else var_95
+        
+        mean, m2, max_drawdown = _summary(arr)
+        volatility = math.sqrt(m2 / (arr.size - 1)) * _SQRT_252 if arr.size > 1 else math.nan
+        sharpe_ratio = (mean * _TRADING_DAYS - self.risk_free_rate) / volatility if volatility != 0 else 0.0
+        
+        return {
+            'var_95': var_95,
+            'var_99': abs(q99),
+            'expected_shortfall': expected_shortfall,
+            'volatility': float(volatility),
+            'sharpe_ratio': float(sharpe_ratio),
+            'max_drawdown': max_drawdown
+        }
+    
+    def _create_empty_results(self, portfolio_id: str, calculation_date: datetime = None) -> RiskResults:
         """Create empty risk results."""
         return RiskResults(
             portfolio_id=portfolio_id,
-            calculation_date=datetime.utcnow(),
+            calculation_date=calculation_date or datetime.utcnow(),
             var_95=0.0,
             var_99=0.0,
             expected_shortfall=0.0,
@@ -449,24 +721,33 @@ class RiskCalculationEngine:
         """Perform stress testing on portfolio."""
         results = {}
         
-        for scenario_name, shock in scenarios.items():
-            try:
-                # Apply shock to returns
-                shocked_returns = portfolio_returns * (1 + shock)
-                
-                # Calculate metrics under stress
-                stressed_var = self.calculate_var(shocked_returns, 0.95)
-                stressed_vol = self.calculate_volatility(shocked_returns)
+        try:
+            arr = _returns_array(portfolio_returns)
+            scales = 1.0 + np.array(list(scenarios.values()), dtype=np.float64)
+            
+            if arr.size == 0:
+                stressed_var = stressed_vol = max_drawdown = np.zeros(scales.size)
+            else:
+                # A shock scales the whole series, so its quantiles and volatility
+                # scale with it; a negative scale swaps the lower tail for the upper
+                (lower, upper), _ = _partitioned_quantiles(arr, (1 - 0.95, 0.95))
+                stressed_var = np.abs(np.where(scales >= 0, scales * lower, scales * upper))
+                stressed_vol = np.abs(scales) * (float(arr.std(ddof=1)) * _SQRT_252)
                 
+                # Drawdown compounds the shocked returns, so it needs a pass per scenario
+                max_drawdown = _stress_drawdowns(arr, scales, self.dtype)
+            
+            for i, (scenario_name, shock) in enumerate(scenarios.items()):
                 results[scenario_name] = {
-                    'var_95': stressed_var,
-                    'volatility': stressed_vol,
-                    'max_drawdown': self.calculate_max_drawdown(shocked_returns),
+                    'var_95': float(stressed_var[i]),
+                    'volatility': float(stressed_vol[i]),
+                    'max_drawdown': float(max_drawdown[i]),
                     'shock_applied': shock
                 }
-                
-            except Exception as e:
-                logger.error(f"Error in stress test scenario {scenario_name}: {e}")
+            
+        except Exception as e:
+            logger.error(f"Error in stress test: {e}")
+            for scenario_name, shock in scenarios.items():
                 results[scenario_name] = {
                     'var_95': 0.0,
                     'volatility': 0.0,
@@ -489,12 +770,16 @@ def get_risk_engine() -> RiskCalculationEngine:
     return _risk_engine
 
 
+# Name the services import the engine factory under
+get_risk_calculator = get_risk_engine
+
+
 # Convenience functions
 def calculate_portfolio_risk(portfolio_id: str, positions: pd.DataFrame, 
-                           price_data: pd.DataFrame) -> RiskResults:
+                           price_data: pd.DataFrame, as_of: datetime = None) -> RiskResults:
     """Calculate portfolio risk metrics."""
     engine = get_risk_engine()
-    return engine.calculate_all_risk_metrics(portfolio_id, positions, price_data)
+    return engine.calculate_all_risk_metrics(portfolio_id, positions, price_data, as_of=as_of)
 
 
 def perform_stress_test(portfolio_returns: pd.Series, 
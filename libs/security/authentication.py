@@ -18,9 +18,10 @@ from email.mime.text import MimeText
 from email.mime.multipart import MimeMultipart
 import json
 
-# Add project root to path
+# Add project root to path (only when not already importable as a package)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if 'libs' not in sys.modules and str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 try:
     from config import get_config
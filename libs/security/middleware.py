@@ -6,6 +6,7 @@ Authentication, authorization, rate limiting, and security headers
 import os
 import json
 import ipaddress
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Callable, Set
 from fastapi import FastAPI, Request, Response, HTTPException, Depends, status
@@ -253,7 +254,7 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
     
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         # Skip validation for certain paths
-        if request.url.path in ['/health', '/metrics', '/docs', '/openapi.json']:
+        if request.url.path in ['/health', '/health/live', '/health/ready', '/metrics', '/docs', '/openapi.json']:
             return await call_next(request)
         
         # Validate content type for POST/PUT requests
@@ -351,8 +352,9 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
 
 
+@lru_cache(maxsize=None)
 def require_permission(permission: Permission):
-    """Dependency factory to require specific permission."""
+    """Dependency factory to require specific permission (one dependency per permission)."""
     async def permission_dependency(user: User = Depends(get_current_user)):
         if not user.has_permission(permission):
             security_logger = get_security_logger()
@@ -373,8 +375,9 @@ def require_permission(permission: Permission):
     return permission_dependency
 
 
+@lru_cache(maxsize=None)
 def require_role(role: Role):
-    """Dependency factory to require specific role."""
+    """Dependency factory to require specific role (one dependency per role)."""
     async def role_dependency(user: User = Depends(get_current_user)):
         if user.role != role:
             security_logger = get_security_logger()
@@ -97,12 +97,13 @@ def install_test_dependencies():
     print("Installing test dependencies...")
     
     test_requirements = [
-        'pytest>=6.0.0',
+        'pytest>=8.2.0',
         'pytest-cov>=2.12.0',
-        'pytest-asyncio>=0.20.0',
+        'pytest-asyncio>=0.24.0',  # loop_scope for the session-scoped async client
         'pytest-benchmark>=3.4.1',
         'pytest-mock>=3.6.1',
         'pytest-xdist>=2.5.0',  # For parallel test execution
+        'pytest-timeout>=2.1.0',  # Per-test wall-clock limit
         'httpx>=0.24.0',  # For async HTTP testing
         'fastapi[all]>=0.100.0',
         'pandas>=1.5.0',
@@ -205,7 +206,7 @@ def run_integration_tests():
         '-v',
         '--tb=short',
         '--junitxml=tests/junit_integration.xml',
-        '-m', 'not slow'
+        '-m', 'integration and not slow'
     ])
     
     print(f"Integration tests result: {'✅ PASSED' if result['success'] else '❌ FAILED'}")
@@ -223,6 +224,9 @@ def run_performance_tests():
         'tests/performance/',
         '-v',
         '--tb=short',
+        '-m', 'performance',  # pytest.ini deselects benchmarks by default
+        '-n', '0',  # Benchmarks must run serially in-process for stable timings
+        '--timeout', '0',  # Benchmark rounds are bounded by benchmark_max_time instead
         '--benchmark-only',
         '--benchmark-sort=mean',
         '--benchmark-columns=min,max,mean,stddev,median,ops,rounds',
@@ -12,9 +12,10 @@ from datetime import datetime
 import sys
 from pathlib import Path
 
-# Add project root to path
+# Add project root to path (only when not already importable as a package)
 PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if 'libs' not in sys.modules and str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 from libs.business.risk_management import RiskCalculator, MarketDataProcessor
 from libs.business.analytics import ReportGenerator
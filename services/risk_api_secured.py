@@ -5,18 +5,24 @@ Integration of security framework with enhanced API functionality
 
 import os
 import sys
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, Depends, Request, Response, status
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import HTTPBearer
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, validator
 import logging
 
-# Add project root to path
-PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+# Add project root to path (only when not already importable as a package)
+PROJECT_ROOT = Path(__file__).parent.parent
+if 'libs' not in sys.modules and str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 try:
     from config import get_config
@@ -29,6 +35,7 @@ try:
     from libs.data.snowflake_client import get_snowflake_client
     from libs.data.market_data_client import get_market_data_provider
     from libs.risk.calculations import get_risk_calculator
+    from libs.storage import get_cache_manager
 except ImportError as e:
     print(f"Import error: {e}")
     # Fallback imports for development
@@ -37,10 +44,31 @@ except ImportError as e:
     get_snowflake_client = lambda: None
     get_market_data_provider = lambda: None
     get_risk_calculator = lambda: None
+    get_cache_manager = lambda: None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+# Application lifecycle
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create pooled service clients once per worker and release them on shutdown."""
+    app.state.snowflake = get_snowflake_client()
+    app.state.market_data = get_market_data_provider()
+    app.state.risk_calculator = get_risk_calculator()
+    
+    yield
+    
+    for client in (app.state.snowflake, app.state.market_data):
+        close = getattr(client, 'close', None)
+        if close:
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Error closing client {type(client).__name__}: {e}")
+
+
 # Initialize FastAPI app with security configuration
 app = FastAPI(
     title="Secured Risk Management API",
@@ -48,18 +76,95 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
+
+def _get_client(name: str, factory: Callable[[], Any]) -> Any:
+    """Return the shared client stored on app state, creating it if startup has not run."""
+    client = getattr(app.state, name, None)
+    if client is None:
+        client = factory()
+        setattr(app.state, name, client)
+    return client
+
+
 # Configure security middleware and authentication
 security_config = {
     'whitelist_enabled': get_config().get('security_whitelist_enabled', False)
 }
 security_manager = configure_security(app, security_config)
 
+# Compress large JSON payloads (risk analyses, market data histories)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Initialize services
 auth_service = get_auth_service()
 metrics_collector = get_metrics_collector()
+cache_manager = get_cache_manager()
+
+# Per-second ISO timestamp cache: (epoch_second, iso_string)
+_timestamp_cache = (0, '')
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as ISO-8601, formatting at most once per second."""
+    global _timestamp_cache
+    second = time.time_ns() // 1_000_000_000
+    cached_second, iso_timestamp = _timestamp_cache
+    if second != cached_second:
+        iso_timestamp = datetime.utcfromtimestamp(second).isoformat()
+        _timestamp_cache = (second, iso_timestamp)
+    return iso_timestamp
+
+
+# Conditional GET cache lifetimes (seconds)
+PORTFOLIOS_ETAG_TTL = 30
+ANALYSIS_CACHE_TTL = 300
+
+
+def _compute_etag(payload: Any) -> str:
+    """Compute a strong ETag for a JSON-serialisable payload."""
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(req: Request, etag: Optional[str]) -> bool:
+    """Check whether the request's If-None-Match header matches the given ETag."""
+    if_none_match = req.headers.get('if-none-match')
+    if not if_none_match or not etag:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+def _portfolios_etag_key(user_id: str) -> str:
+    """Cache key holding the ETag of a user's portfolio list."""
+    return f"portfolios:etag:{user_id}"
+
+
+def invalidate_portfolios_etag(user_id: str) -> None:
+    """
+    Drop the cached portfolio-list ETag for a user. Every code path that
+    creates, updates or deletes a user's portfolios must call this, otherwise
+    GET /portfolios keeps answering 304 until the ETag expires.
+    """
+    if cache_manager:
+        cache_manager.delete(_portfolios_etag_key(user_id))
+
+
+# Validation constants shared by the request models (built once at import)
+_ALLOWED_RISK_METRICS = frozenset(['var', 'volatility', 'sharpe', 'beta', 'alpha', 'max_drawdown', 'sortino'])
+_USERNAME_SEPARATORS = str.maketrans('', '', '_-')
+_SYMBOL_SEPARATORS = str.maketrans('', '', '.-')
+
+
+def _validate_username(v: str) -> str:
+    """Shared username validator: alphanumeric with optional underscores/hyphens."""
+    if not v.translate(_USERNAME_SEPARATORS).isalnum():
+        raise ValueError('Username must be alphanumeric with optional underscores/hyphens')
+    return v
 
 
 # Pydantic models for request/response validation
@@ -69,11 +174,7 @@ class LoginRequest(BaseModel):
     totp_token: Optional[str] = Field(None, regex=r'^\d{6}$')
     backup_code: Optional[str] = Field(None, min_length=8, max_length=8)
     
-    @validator('username')
-    def username_alphanumeric(cls, v):
-        if not v.replace('_', '').replace('-', '').isalnum():
-            raise ValueError('Username must be alphanumeric with optional underscores/hyphens')
-        return v
+    _username_alphanumeric = validator('username', allow_reuse=True)(_validate_username)
 
 
 class RegisterRequest(BaseModel):
@@ -83,11 +184,7 @@ class RegisterRequest(BaseModel):
     first_name: Optional[str] = Field(None, max_length=50)
     last_name: Optional[str] = Field(None, max_length=50)
     
-    @validator('username')
-    def username_alphanumeric(cls, v):
-        if not v.replace('_', '').replace('-', '').isalnum():
-            raise ValueError('Username must be alphanumeric with optional underscores/hyphens')
-        return v
+    _username_alphanumeric = validator('username', allow_reuse=True)(_validate_username)
 
 
 class PasswordResetRequest(BaseModel):
@@ -108,9 +205,8 @@ class PortfolioAnalysisRequest(BaseModel):
     
     @validator('risk_metrics')
     def validate_risk_metrics(cls, v):
-        allowed_metrics = ['var', 'volatility', 'sharpe', 'beta', 'alpha', 'max_drawdown', 'sortino']
         for metric in v:
-            if metric not in allowed_metrics:
+            if metric not in _ALLOWED_RISK_METRICS:
                 raise ValueError(f'Invalid risk metric: {metric}')
         return v
 
@@ -131,11 +227,48 @@ class MarketDataRequest(BaseModel):
     @validator('symbols')
     def validate_symbols(cls, v):
         for symbol in v:
-            if not symbol.replace('.', '').replace('-', '').isalnum():
+            if not symbol.translate(_SYMBOL_SEPARATORS).isalnum():
                 raise ValueError(f'Invalid symbol format: {symbol}')
         return v
 
 
+# Risk metric dispatch: metric name -> (calculator call, result key)
+_METRIC_DISPATCH: Dict[str, tuple] = {
+    'var': (
+        lambda rc, holdings, market_data, cl: rc.calculate_portfolio_var(
+            holdings, market_data, confidence_level=cl
+        ),
+        'var'
+    ),
+    'volatility': (
+        lambda rc, holdings, market_data, cl: rc.calculate_portfolio_volatility(holdings, market_data),
+        'volatility'
+    ),
+    'sharpe': (
+        lambda rc, holdings, market_data, cl: rc.calculate_sharpe_ratio(holdings, market_data),
+        'sharpe_ratio'
+    ),
+    'beta': (
+        lambda rc, holdings, market_data, cl: rc.calculate_portfolio_beta(holdings, market_data),
+        'beta'
+    ),
+    'alpha': (
+        lambda rc, holdings, market_data, cl: rc.calculate_alpha(holdings, market_data),
+        'alpha'
+    ),
+}
+
+
+# Permission dependencies, built once at import and shared across routes
+_REQUIRE_PORTFOLIO_READ = Depends(require_permission(Permission.PORTFOLIO_READ))
+_REQUIRE_RISK_CALCULATE = Depends(require_permission(Permission.RISK_CALCULATE))
+_REQUIRE_RISK_STRESS_TEST = Depends(require_permission(Permission.RISK_STRESS_TEST))
+_REQUIRE_MARKET_DATA_READ = Depends(require_permission(Permission.MARKET_DATA_READ))
+_REQUIRE_ADMIN_USERS = Depends(require_permission(Permission.ADMIN_USERS))
+_REQUIRE_ADMIN_SYSTEM = Depends(require_permission(Permission.ADMIN_SYSTEM))
+_REQUIRE_ADMIN_READ = Depends(require_permission(Permission.ADMIN_READ))
+
+
 # Authentication endpoints
 @app.post("/auth/login", tags=["Authentication"])
 async def login(request: LoginRequest, req: Request):
@@ -270,11 +403,22 @@ async def enable_mfa(totp_token: str, user: User = Depends(get_current_user)):
 # Portfolio endpoints with security
 @app.get("/portfolios", tags=["Portfolio"])
 async def get_portfolios(
-    user: User = Depends(require_permission(Permission.PORTFOLIO_READ))
+    req: Request,
+    user: User = _REQUIRE_PORTFOLIO_READ
 ):
-    """Get user's portfolios."""
+    """Get user's portfolios (supports conditional GET via ETag)."""
     try:
-        snowflake_client = get_snowflake_client()
+        etag_key = _portfolios_etag_key(user.user_id)
+        
+        # Unchanged since the client's last fetch: skip the database entirely.
+        # The ETag is stored wrapped in a dict: a bare '"<hex>"' string would be
+        # JSON-decoded by CacheManager.get on the Redis path and lose its quotes
+        cached = cache_manager.get(etag_key) if cache_manager else None
+        cached_etag = cached.get('etag') if isinstance(cached, dict) else None
+        if _etag_matches(req, cached_etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': cached_etag})
+        
+        snowflake_client = _get_client('snowflake', get_snowflake_client)
         if not snowflake_client:
             raise HTTPException(status_code=503, detail="Database service unavailable")
         
@@ -283,10 +427,18 @@ async def get_portfolios(
         if metrics_collector:
             metrics_collector.record_request('get_portfolios', 'portfolio')
         
-        return {
+        payload = {
             'portfolios': portfolios,
             'count': len(portfolios)
         }
+        etag = _compute_etag(payload)
+        if cache_manager:
+            cache_manager.set(etag_key, {'etag': etag}, ttl=PORTFOLIOS_ETAG_TTL)
+        
+        if _etag_matches(req, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        
+        return JSONResponse(content=payload, headers={'ETag': etag})
         
     except Exception as e:
         logger.error(f"Error fetching portfolios: {e}")
@@ -299,12 +451,14 @@ async def get_portfolios(
 async def analyze_portfolio(
     portfolio_id: str,
     request: PortfolioAnalysisRequest,
-    user: User = Depends(require_permission(Permission.RISK_CALCULATE))
+    req: Request,
+    response: Response,
+    user: User = _REQUIRE_RISK_CALCULATE
 ):
     """Perform comprehensive portfolio risk analysis."""
     try:
         # Validate portfolio access
-        snowflake_client = get_snowflake_client()
+        snowflake_client = _get_client('snowflake', get_snowflake_client)
         if not snowflake_client:
             raise HTTPException(status_code=503, detail="Database service unavailable")
         
@@ -317,61 +471,82 @@ async def analyze_portfolio(
         if portfolio.get('user_id') != user.user_id and not user.has_permission(Permission.ADMIN_READ):
             raise HTTPException(status_code=403, detail="Access denied to portfolio")
         
-        # Get portfolio holdings
-        holdings = snowflake_client.get_portfolio_holdings(portfolio_id)
-        
-        # Get market data for analysis period
-        market_data_provider = get_market_data_provider()
-        symbols = [holding['symbol'] for holding in holdings]
-        
-        market_data = market_data_provider.get_price_history(
-            symbols=symbols,
-            start_date=request.start_date,
-            end_date=request.end_date
+        # Serve completed analyses from cache, keyed by the full request shape
+        cache_key = (
+            f"analysis:{portfolio_id}:{request.start_date}:{request.end_date}:"
+            f"{','.join(sorted(request.risk_metrics))}:{request.confidence_level}"
         )
+        cached = cache_manager.get(cache_key) if cache_manager else None
         
-        # Calculate risk metrics
-        risk_calculator = get_risk_calculator()
-        
-        analysis_results = {}
+        # Results are deterministic for a given request; let clients reuse them briefly
+        cache_headers = {'Cache-Control': 'private, max-age=30'}
         
-        for metric in request.risk_metrics:
-            if metric == 'var':
-                var_result = risk_calculator.calculate_portfolio_var(
-                    holdings, market_data, confidence_level=request.confidence_level
+        if cached:
+            etag = cached['etag']
+            if _etag_matches(req, etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={'ETag': etag, **cache_headers}
                 )
-                analysis_results['var'] = var_result
-                
-            elif metric == 'volatility':
-                volatility = risk_calculator.calculate_portfolio_volatility(holdings, market_data)
-                analysis_results['volatility'] = volatility
-                
-            elif metric == 'sharpe':
-                sharpe = risk_calculator.calculate_sharpe_ratio(holdings, market_data)
-                analysis_results['sharpe_ratio'] = sharpe
-                
-            elif metric == 'beta':
-                beta = risk_calculator.calculate_portfolio_beta(holdings, market_data)
-                analysis_results['beta'] = beta
-                
-            elif metric == 'alpha':
-                alpha = risk_calculator.calculate_alpha(holdings, market_data)
-                analysis_results['alpha'] = alpha
+            analysis_results = cached['risk_metrics']
+            holdings_count = cached['holdings_count']
+        else:
+            # Get portfolio holdings
+            holdings = snowflake_client.get_portfolio_holdings(portfolio_id)
+            holdings_count = len(holdings)
+            
+            # Get market data for analysis period
+            market_data_provider = _get_client('market_data', get_market_data_provider)
+            symbols = [holding['symbol'] for holding in holdings]
+            
+            market_data = market_data_provider.get_price_history(
+                symbols=symbols,
+                start_date=request.start_date,
+                end_date=request.end_date
+            )
+            
+            # Calculate risk metrics
+            risk_calculator = _get_client('risk_calculator', get_risk_calculator)
+            
+            analysis_results = {}
+            
+            for metric in request.risk_metrics:
+                dispatch = _METRIC_DISPATCH.get(metric)
+                if dispatch is None:
+                    continue
+                calculate, result_key = dispatch
+                analysis_results[result_key] = calculate(
+                    risk_calculator, holdings, market_data, request.confidence_level
+                )
+            
+            etag = _compute_etag({
+                'risk_metrics': analysis_results,
+                'holdings_count': holdings_count
+            })
+            if cache_manager:
+                cache_manager.set(cache_key, {
+                    'etag': etag,
+                    'risk_metrics': analysis_results,
+                    'holdings_count': holdings_count
+                }, ttl=ANALYSIS_CACHE_TTL)
         
         if metrics_collector:
             metrics_collector.record_request('portfolio_analysis', 'risk')
             metrics_collector.record_business_metric('risk_calculations_performed', len(request.risk_metrics))
         
+        response.headers['ETag'] = etag
+        response.headers.update(cache_headers)
+        
         return {
             'portfolio_id': portfolio_id,
-            'analysis_date': datetime.utcnow().isoformat(),
+            'analysis_date': _utc_timestamp(),
             'period': {
                 'start_date': request.start_date,
                 'end_date': request.end_date
             },
             'risk_metrics': analysis_results,
             'metadata': {
-                'holdings_count': len(holdings),
+                'holdings_count': holdings_count,
                 'confidence_level': request.confidence_level,
                 'calculated_by': user.username
             }
@@ -389,12 +564,12 @@ async def analyze_portfolio(
 @app.post("/stress-test", tags=["Risk Analysis"])
 async def perform_stress_test(
     request: StressTestRequest,
-    user: User = Depends(require_permission(Permission.RISK_STRESS_TEST))
+    user: User = _REQUIRE_RISK_STRESS_TEST
 ):
     """Perform stress testing on portfolio."""
     try:
-        snowflake_client = get_snowflake_client()
-        risk_calculator = get_risk_calculator()
+        snowflake_client = _get_client('snowflake', get_snowflake_client)
+        risk_calculator = _get_client('risk_calculator', get_risk_calculator)
         
         # Get portfolio and validate access
         portfolio = snowflake_client.get_portfolio_by_id(request.portfolio_id)
@@ -433,7 +608,7 @@ async def perform_stress_test(
         return {
             'portfolio_id': request.portfolio_id,
             'scenario_type': request.scenario_type,
-            'test_date': datetime.utcnow().isoformat(),
+            'test_date': _utc_timestamp(),
             'results': results,
             'metadata': {
                 'stress_factor': request.stress_factor,
@@ -453,11 +628,11 @@ async def perform_stress_test(
 @app.post("/market-data", tags=["Market Data"])
 async def get_market_data(
     request: MarketDataRequest,
-    user: User = Depends(require_permission(Permission.MARKET_DATA_READ))
+    user: User = _REQUIRE_MARKET_DATA_READ
 ):
     """Fetch market data for specified symbols."""
     try:
-        market_data_provider = get_market_data_provider()
+        market_data_provider = _get_client('market_data', get_market_data_provider)
         
         data = market_data_provider.get_price_history(
             symbols=request.symbols,
@@ -481,7 +656,7 @@ async def get_market_data(
                 'symbols_count': len(request.symbols),
                 'data_source': request.data_source,
                 'fetched_by': user.username,
-                'fetch_time': datetime.utcnow().isoformat()
+                'fetch_time': _utc_timestamp()
             }
         }
         
@@ -495,7 +670,7 @@ async def get_market_data(
 # Admin endpoints
 @app.get("/admin/users", tags=["Administration"])
 async def get_users(
-    user: User = Depends(require_permission(Permission.ADMIN_USERS))
+    user: User = _REQUIRE_ADMIN_USERS
 ):
     """Get all users (admin only)."""
     try:
@@ -503,7 +678,7 @@ async def get_users(
         
         return {
             'statistics': stats,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': _utc_timestamp()
         }
         
     except Exception as e:
@@ -513,7 +688,7 @@ async def get_users(
 
 @app.get("/admin/security-status", tags=["Administration"])
 async def get_security_status(
-    user: User = Depends(require_permission(Permission.ADMIN_SYSTEM))
+    user: User = _REQUIRE_ADMIN_SYSTEM
 ):
     """Get security system status (admin only)."""
     try:
@@ -525,25 +700,36 @@ async def get_security_status(
 
 
 # Health and monitoring endpoints
+HEALTH_CACHE_TTL = 5.0
+_health_cache: Dict[str, Any] = {'ts': 0.0, 'payload': None}
+
+
+def _probe_services() -> Dict[str, Any]:
+    """Probe backing services, reusing the last result for HEALTH_CACHE_TTL seconds."""
+    now = time.monotonic()
+    if _health_cache['payload'] is not None and now - _health_cache['ts'] < HEALTH_CACHE_TTL:
+        return _health_cache['payload']
+    
+    services = {
+        'authentication': True,
+        'database': bool(_get_client('snowflake', get_snowflake_client)),
+        'market_data': bool(_get_client('market_data', get_market_data_provider)),
+        'risk_engine': bool(_get_client('risk_calculator', get_risk_calculator))
+    }
+    payload = {
+        'status': 'healthy' if all(services.values()) else 'degraded',
+        'services': services
+    }
+    _health_cache['ts'] = now
+    _health_cache['payload'] = payload
+    return payload
+
+
 @app.get("/health", tags=["Monitoring"])
 async def health_check():
     """Health check endpoint (no authentication required)."""
     try:
-        # Basic health checks
-        health_status = {
-            'status': 'healthy',
-            'timestamp': datetime.utcnow().isoformat(),
-            'services': {
-                'authentication': True,
-                'database': bool(get_snowflake_client()),
-                'market_data': bool(get_market_data_provider()),
-                'risk_engine': bool(get_risk_calculator())
-            }
-        }
-        
-        # Check if all services are healthy
-        all_healthy = all(health_status['services'].values())
-        health_status['status'] = 'healthy' if all_healthy else 'degraded'
+        health_status = {'timestamp': _utc_timestamp(), **_probe_services()}
         
         if metrics_collector:
             metrics_collector.record_request('health_check', 'monitoring')
@@ -554,14 +740,34 @@ async def health_check():
         logger.error(f"Health check failed: {e}")
         return {
             'status': 'unhealthy',
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': _utc_timestamp(),
             'error': str(e)
         }
 
 
+@app.get("/health/live", tags=["Monitoring"])
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests."""
+    return {'status': 'alive', 'timestamp': _utc_timestamp()}
+
+
+@app.get("/health/ready", tags=["Monitoring"])
+async def readiness_check():
+    """Readiness probe: backing services are available."""
+    try:
+        readiness = {'timestamp': _utc_timestamp(), **_probe_services()}
+    except Exception as e:
+        logger.error(f"Readiness check failed: {e}")
+        readiness = {'status': 'unhealthy', 'timestamp': _utc_timestamp(), 'error': str(e)}
+    
+    if readiness['status'] != 'healthy':
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=readiness)
+    return readiness
+
+
 @app.get("/metrics", tags=["Monitoring"])
 async def get_metrics(
-    user: User = Depends(require_permission(Permission.ADMIN_READ))
+    user: User = _REQUIRE_ADMIN_READ
 ):
     """Get system metrics (admin only)."""
     try:
@@ -594,14 +800,32 @@ async def get_user_permissions(user: User = Depends(get_current_user)):
 
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     
-    # Configure for secure deployment
+    fastapi_config = get_config().get('fastapi', {})
+    workers = fastapi_config.get('workers', 1)
+    
+    # Tokens are only valid across workers if every worker signs with the same
+    # key, and the auth service keeps users and reset/verification tokens in
+    # process memory, so a request routed to another worker would not see them
+    if workers > 1:
+        missing = ['a shared user/token store (AuthenticationService keeps them in process memory)']
+        if not os.getenv('JWT_SECRET_KEY'):
+            missing.insert(0, 'JWT_SECRET_KEY (each worker would sign tokens with its own random key)')
+        raise SystemExit(f"Refusing to start {workers} workers; multiple workers need " + " and ".join(missing))
+    
+    # Configure for secure deployment; uvloop/httptools are used whenever they are installed
     uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
+        "services.risk_api_secured:app",
+        host=fastapi_config.get('host', '0.0.0.0'),
+        port=fastapi_config.get('port', 8000),
+        workers=workers,
+        loop="uvloop" if importlib.util.find_spec('uvloop') else "asyncio",
+        http="httptools" if importlib.util.find_spec('httptools') else "h11",
+        limit_concurrency=fastapi_config.get('limit_concurrency'),
+        backlog=fastapi_config.get('backlog', 2048),
         ssl_keyfile=os.getenv('SSL_KEY_FILE'),
         ssl_certfile=os.getenv('SSL_CERT_FILE'),
         log_level="info"
-    )
\ No newline at end of file
+    )
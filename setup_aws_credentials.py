@@ -6,6 +6,8 @@ This script helps you configure AWS credentials in the config/.env file for test
 
 import os
 import getpass
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
 
 def setup_aws_credentials():
@@ -43,55 +45,34 @@ def setup_aws_credentials():
     
     aws_session_token = input("AWS Session Token (optional, press Enter to skip): ").strip()
     
-    # Read current config/.env file
+    # Parse config/.env once into an ordered map keyed by variable name;
+    # comments and blank lines keep their position under a unique key
+    env = OrderedDict()
     with open(env_file, 'r') as f:
-        lines = f.readlines()
-    
-    # Update AWS credentials in config/.env file
-    updated_lines = []
-    credentials_updated = {
-        'AWS_ACCESS_KEY_ID': False,
-        'AWS_SECRET_ACCESS_KEY': False,
-        'AWS_REGION': False,
-        'AWS_DEFAULT_REGION': False,
-        'AWS_SESSION_TOKEN': False
-    }
-    
-    for line in lines:
-        if line.startswith('AWS_ACCESS_KEY_ID='):
-            updated_lines.append(f'AWS_ACCESS_KEY_ID={aws_access_key}\n')
-            credentials_updated['AWS_ACCESS_KEY_ID'] = True
-        elif line.startswith('AWS_SECRET_ACCESS_KEY='):
-            updated_lines.append(f'AWS_SECRET_ACCESS_KEY={aws_secret_key}\n')
-            credentials_updated['AWS_SECRET_ACCESS_KEY'] = True
-        elif line.startswith('AWS_REGION='):
-            updated_lines.append(f'AWS_REGION={aws_region}\n')
-            credentials_updated['AWS_REGION'] = True
-        elif line.startswith('AWS_DEFAULT_REGION='):
-            updated_lines.append(f'AWS_DEFAULT_REGION={aws_region}\n')
-            credentials_updated['AWS_DEFAULT_REGION'] = True
-        elif line.startswith('AWS_SESSION_TOKEN='):
-            if aws_session_token:
-                updated_lines.append(f'AWS_SESSION_TOKEN={aws_session_token}\n')
-            else:
-                updated_lines.append('#AWS_SESSION_TOKEN=your_session_token_here\n')
-            credentials_updated['AWS_SESSION_TOKEN'] = True
-        else:
-            updated_lines.append(line)
-    
-    # Add any missing credentials
-    if not credentials_updated['AWS_ACCESS_KEY_ID']:
-        updated_lines.append(f'AWS_ACCESS_KEY_ID={aws_access_key}\n')
-    if not credentials_updated['AWS_SECRET_ACCESS_KEY']:
-        updated_lines.append(f'AWS_SECRET_ACCESS_KEY={aws_secret_key}\n')
-    if not credentials_updated['AWS_REGION']:
-        updated_lines.append(f'AWS_REGION={aws_region}\n')
-    if not credentials_updated['AWS_DEFAULT_REGION']:
-        updated_lines.append(f'AWS_DEFAULT_REGION={aws_region}\n')
-    
-    # Write updated config/.env file
-    with open(env_file, 'w') as f:
-        f.writelines(updated_lines)
+        for index, line in enumerate(f):
+            name, sep, _ = line.partition('=')
+            key = name.strip() if sep and not line.lstrip().startswith('#') else (None, index)
+            env[key] = line
+    
+    # Update AWS credentials (missing entries are appended in order)
+    env['AWS_ACCESS_KEY_ID'] = f'AWS_ACCESS_KEY_ID={aws_access_key}\n'
+    env['AWS_SECRET_ACCESS_KEY'] = f'AWS_SECRET_ACCESS_KEY={aws_secret_key}\n'
+    env['AWS_REGION'] = f'AWS_REGION={aws_region}\n'
+    env['AWS_DEFAULT_REGION'] = f'AWS_DEFAULT_REGION={aws_region}\n'
+    if aws_session_token:
+        env['AWS_SESSION_TOKEN'] = f'AWS_SESSION_TOKEN={aws_session_token}\n'
+    elif 'AWS_SESSION_TOKEN' in env:
+        env['AWS_SESSION_TOKEN'] = '#AWS_SESSION_TOKEN=your_session_token_here\n'
+    
+    # Write updated config/.env file atomically
+    fd, tmp_path = tempfile.mkstemp(dir=env_file.parent, prefix='.env.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.writelines(env.values())
+        os.replace(tmp_path, env_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
     
     print()
     print("✅ AWS credentials successfully configured in config/.env file!")
@@ -136,11 +117,17 @@ def verify_aws_access():
             print("❌ Could not create AWS session")
             return False
         
-        # Try to list S3 buckets as a simple test
-        s3 = session.client('s3')
-        response = s3.list_buckets()
+        # A single STS round-trip validates the credentials without
+        # enumerating account resources; fail fast on network problems
+        from botocore.config import Config
+        sts = session.client('sts', config=Config(
+            retries={'mode': 'standard', 'max_attempts': 2},
+            connect_timeout=3,
+            read_timeout=5
+        ))
+        identity = sts.get_caller_identity()
         
-        print(f"✅ AWS access verified! Found {len(response['Buckets'])} S3 buckets.")
+        print(f"✅ AWS access verified! Authenticated as {identity['Arn']}")
         return True
     
     except ImportError as e:
@@ -0,0 +1,98 @@
+"""
+Shared fixtures for the API integration tests
+"""
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.test_framework import MockSnowflakeConnector, MockMarketDataProvider, MockRiskEngine
+
+# Principal injected in place of JWT verification when auth isn't under test
+TEST_USER = {"username": "test_user", "role": "admin", "user_id": "test_001"}
+
+
+@pytest.fixture(scope="session")
+def api_module():
+    """The service module, imported only once a test actually needs it."""
+    import services.risk_api_enhanced as module
+    return module
+
+
+@pytest.fixture(scope="session")
+def app(api_module):
+    """The FastAPI application under test."""
+    return api_module.app
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _wire_mocks(api_module, app):
+    """
+    Swap the API's data sources for mocks and stub out token auth once per session.
+
+    Module globals are per-process, so each xdist worker wires its own copy;
+    the guard keeps repeated requests for the fixture from re-instantiating mocks.
+    """
+    if getattr(api_module, "_mocks_installed", False):
+        yield
+        return
+
+    originals = (api_module.snowflake_connector,
+                 api_module.market_data_provider,
+                 api_module.risk_engine)
+    api_module.snowflake_connector = MockSnowflakeConnector()
+    api_module.market_data_provider = MockMarketDataProvider()
+    api_module.risk_engine = MockRiskEngine()
+    api_module._mocks_installed = True
+    app.dependency_overrides[api_module.get_current_user_from_token] = lambda: TEST_USER
+
+    yield
+
+    app.dependency_overrides.pop(api_module.get_current_user_from_token, None)
+
+    (api_module.snowflake_connector,
+     api_module.market_data_provider,
+     api_module.risk_engine) = originals
+    api_module._mocks_installed = False
+
+
+@pytest.fixture(scope="session")
+def client(app, _wire_mocks):
+    """One TestClient (and app lifespan) shared by the whole session."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def real_auth(api_module, app, _wire_mocks):
+    """Run a test against the real JWT dependency instead of the stub user."""
+    override = app.dependency_overrides.pop(api_module.get_current_user_from_token, None)
+    yield
+    if override is not None:
+        app.dependency_overrides[api_module.get_current_user_from_token] = override
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client(app, _wire_mocks):
+    """
+    One AsyncClient whose connection pool is reused across async tests.
+
+    It lives on the session event loop, so tests using it must be marked
+    @pytest.mark.asyncio(loop_scope="session") (pytest-asyncio >= 0.24).
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=32)
+    ) as test_client:
+        yield test_client
@@ -4,442 +4,330 @@ Tests end-to-end functionality with real implementations
 """
 
 import sys
+import functools
 import pytest
-import asyncio
+import anyio
 from pathlib import Path
-from typing import Dict, Any
-import httpx
-from fastapi.testclient import TestClient
-import pandas as pd
+from typing import Any
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from tests.test_framework import TestBase, MockSnowflakeConnector, MockMarketDataProvider, MockRiskEngine
-from services.risk_api_enhanced import app
-
-
-class TestRiskAPIIntegration(TestBase):
-    """Integration tests for the enhanced Risk Management API."""
-    
-    @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-        cls.client = TestClient(app)
-        
-        # Mock the data sources for consistent testing
-        import services.risk_api_enhanced as api_module
-        api_module.snowflake_connector = cls.mock_snowflake
-        api_module.market_data_provider = cls.mock_market_data
-        api_module.risk_engine = cls.mock_risk_engine
-    
-    def test_root_endpoint(self):
-        """Test root endpoint returns correct information."""
-        response = self.client.get("/")
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("service", data)
-        self.assertIn("version", data)
-        self.assertIn("features", data)
-        self.assertEqual(data["service"], "Enhanced Risk Management API")
-        self.assertEqual(data["version"], "2.0.0")
-    
-    def test_health_endpoints(self):
-        """Test health check endpoints."""
-        # Test basic health
-        response = self.client.get("/health")
-        self.assertIn(response.status_code, [200, 503])  # May fail if dependencies not available
-        
-        # Test liveness probe
-        response = self.client.get("/health/liveness")
-        self.assertEqual(response.status_code, 200)
-        
-        # Test readiness probe  
-        response = self.client.get("/health/readiness")
-        self.assertIn(response.status_code, [200, 503])
-    
-    def test_metrics_endpoint(self):
-        """Test Prometheus metrics endpoint."""
-        response = self.client.get("/metrics")
-        
-        # Should return metrics or graceful failure
-        self.assertIn(response.status_code, [200, 503])
-        
-        if response.status_code == 200:
-            self.assertIn("text/plain", response.headers.get("content-type", ""))
-    
-    def test_login_development_mode(self):
-        """Test login in development mode."""
-        login_data = {
-            "username": "test_user",
-            "password": "test_password"
-        }
-        
-        response = self.client.post("/auth/login", json=login_data)
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("access_token", data)
-        self.assertIn("token_type", data)
-        self.assertIn("user", data)
-        self.assertEqual(data["token_type"], "bearer")
-    
-    def test_portfolio_risk_calculation(self):
-        """Test portfolio risk calculation endpoint."""
-        # First login to get token
-        login_response = self.client.post("/auth/login", json={
-            "username": "test_user", 
-            "password": "test_password"
-        })
-        token = login_response.json()["access_token"]
-        
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Test risk calculation
-        risk_request = {
-            "portfolio_id": "TEST_PORTFOLIO",
-            "start_date": "2023-01-01",
-            "end_date": "2023-12-31"
-        }
-        
-        response = self.client.post(
-            "/api/v1/risk/calculate",
-            json=risk_request,
-            headers=headers
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        # Validate response structure
-        required_fields = [
-            "portfolio_id", "calculation_date", "var_95", "var_99",
-            "expected_shortfall", "volatility", "sharpe_ratio", 
-            "max_drawdown", "beta", "alpha"
-        ]
-        
-        for field in required_fields:
-            self.assertIn(field, data)
-        
-        # Validate data types and ranges
-        self.assertEqual(data["portfolio_id"], "TEST_PORTFOLIO")
-        self.assertIsInstance(data["var_95"], (int, float))
-        self.assertGreaterEqual(data["var_95"], 0)
-        self.assertGreaterEqual(data["var_99"], data["var_95"])
-    
-    def test_stress_testing(self):
-        """Test stress testing endpoint."""
-        # Login first
-        login_response = self.client.post("/auth/login", json={
-            "username": "test_user",
-            "password": "test_password"
-        })
-        token = login_response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Test stress test
-        stress_request = {
-            "portfolio_id": "TEST_PORTFOLIO",
-            "scenarios": {
-                "market_crash": -0.30,
-                "volatility_spike": 0.60
-            }
-        }
-        
-        response = self.client.post(
-            "/api/v1/risk/stress-test",
-            json=stress_request,
-            headers=headers
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("portfolio_id", data)
-        self.assertIn("stress_test_results", data)
-        self.assertIn("calculated_at", data)
-        
-        # Validate stress test results
-        stress_results = data["stress_test_results"]
-        self.assertIsInstance(stress_results, dict)
-        
-        for scenario in stress_request["scenarios"]:
-            self.assertIn(scenario, stress_results)
-    
-    def test_market_data_endpoints(self):
-        """Test market data endpoints."""
-        # Login
-        login_response = self.client.post("/auth/login", json={
-            "username": "test_user",
-            "password": "test_password"
-        })
-        token = login_response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Test historical data
-        market_request = {
-            "symbols": ["AAPL", "MSFT"],
-            "start_date": "2023-01-01",
-            "end_date": "2023-01-31"
-        }
-        
-        response = self.client.post(
-            "/api/v1/market-data/prices",
-            json=market_request,
-            headers=headers
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("symbols", data)
-        self.assertIn("data_points", data)
-        self.assertIn("data", data)
-        self.assertEqual(data["symbols"], ["AAPL", "MSFT"])
-        
-        # Test latest price
-        response = self.client.get(
-            "/api/v1/market-data/latest/AAPL",
-            headers=headers
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("symbol", data)
-        self.assertIn("price", data)
-        self.assertIn("change", data)
-        self.assertEqual(data["symbol"], "AAPL")
-    
-    def test_snowflake_integration(self):
-        """Test Snowflake integration endpoints."""
-        # Login
-        login_response = self.client.post("/auth/login", json={
-            "username": "admin_user",
-            "password": "admin_password"
-        })
-        token = login_response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Test warehouse information
-        response = self.client.get(
-            "/api/v1/snowflake/warehouses",
-            headers=headers
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("warehouses", data)
-        self.assertIsInstance(data["warehouses"], list)
-        
-        if data["warehouses"]:
-            warehouse = data["warehouses"][0]
-            self.assertIn("name", warehouse)
-            self.assertIn("state", warehouse)
-        
-        # Test databases
-        response = self.client.get(
-            "/api/v1/snowflake/databases",
-            headers=headers
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("databases", data)
-        self.assertIsInstance(data["databases"], list)
-        
-        # Test analytics query
-        query_request = {
-            "query": "SELECT 1 as test_column",
-            "use_cache": False
-        }
-        
-        response = self.client.post(
-            "/api/v1/snowflake/query",
-            json=query_request,
-            headers=headers
-        )
-        
-        # May succeed or fail depending on mock implementation
-        self.assertIn(response.status_code, [200, 500, 503])
-    
-    def test_portfolio_management(self):
-        """Test portfolio management endpoints.""" 
-        # Login
-        login_response = self.client.post("/auth/login", json={
-            "username": "test_user",
-            "password": "test_password"
-        })
-        token = login_response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Test portfolio list
-        response = self.client.get(
-            "/api/v1/portfolios",
-            headers=headers
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("portfolios", data)
-        self.assertIn("count", data)
-        self.assertIsInstance(data["portfolios"], list)
-        self.assertGreaterEqual(data["count"], 0)
-    
-    def test_system_info(self):
-        """Test system information endpoint."""
-        response = self.client.get("/api/v1/system/info")
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        self.assertIn("service", data)
-        self.assertIn("version", data) 
-        self.assertIn("environment", data)
-        self.assertIn("features", data)
-        self.assertIn("data_sources", data)
-        
-        # Validate features
-        features = data["features"]
-        self.assertIsInstance(features, dict)
-        
-        expected_features = [
-            "snowflake_integration", "market_data_provider", 
-            "risk_engine", "prometheus_metrics", "health_checks"
-        ]
-        
-        for feature in expected_features:
-            self.assertIn(feature, features)
-            self.assertIsInstance(features[feature], bool)
-    
-    def test_unauthorized_access(self):
-        """Test that endpoints require authentication."""
-        # Test without token
-        response = self.client.post("/api/v1/risk/calculate", json={
-            "portfolio_id": "TEST"
-        })
-        
-        self.assertEqual(response.status_code, 403)  # Or 401 depending on implementation
-        
-        # Test with invalid token
-        headers = {"Authorization": "Bearer invalid_token"}
-        response = self.client.post("/api/v1/risk/calculate", json={
-            "portfolio_id": "TEST"
-        }, headers=headers)
-        
-        self.assertIn(response.status_code, [401, 403])
-    
-    def test_input_validation(self):
-        """Test input validation."""
-        # Login
-        login_response = self.client.post("/auth/login", json={
-            "username": "test_user",
-            "password": "test_password"
-        })
-        token = login_response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Test missing required fields
-        response = self.client.post(
-            "/api/v1/risk/calculate",
-            json={},  # Missing portfolio_id
-            headers=headers
-        )
-        
-        self.assertEqual(response.status_code, 422)  # Validation error
-        
-        # Test invalid date format
-        response = self.client.post(
-            "/api/v1/market-data/prices",
-            json={
-                "symbols": ["AAPL"],
-                "start_date": "invalid-date"
-            },
-            headers=headers
-        )
-        
-        # Should handle gracefully
-        self.assertIn(response.status_code, [400, 422, 500])
-    
-    def test_error_handling(self):
-        """Test error handling and responses.""" 
-        # Login
-        login_response = self.client.post("/auth/login", json={
-            "username": "test_user",
-            "password": "test_password"
-        })
-        token = login_response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Test non-existent portfolio
-        response = self.client.post(
-            "/api/v1/risk/calculate",
-            json={"portfolio_id": "NON_EXISTENT_PORTFOLIO"},
-            headers=headers
-        )
-        
-        # Should handle gracefully (may return empty results or 404)
-        self.assertIn(response.status_code, [200, 404, 500])
-        
-        if response.status_code == 200:
-            # If successful, should have valid structure
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _loads = json.loads
+    _dumps = lambda obj: json.dumps(obj).encode()
+
+pytestmark = pytest.mark.integration
+
+# Upper bound on in-flight requests in the async concurrency tests
+MAX_CONCURRENT_REQUESTS = 16
+
+# Request bodies shared across tests, serialized once at import
+JSON_HEADERS = {"content-type": "application/json"}
+STRESS_SCENARIOS = {
+    "market_crash": -0.30,
+    "volatility_spike": 0.60
+}
+_LOGIN_BODY = _dumps({
+    "username": "test_user",
+    "password": "test_password"
+})
+_RISK_BODY = _dumps({
+    "portfolio_id": "TEST_PORTFOLIO",
+    "start_date": "2023-01-01",
+    "end_date": "2023-12-31"
+})
+_STRESS_BODY = _dumps({
+    "portfolio_id": "TEST_PORTFOLIO",
+    "scenarios": STRESS_SCENARIOS
+})
+_MARKET_BODY = _dumps({
+    "symbols": ["AAPL", "MSFT"],
+    "start_date": "2023-01-01",
+    "end_date": "2023-01-31"
+})
+
+
+@functools.lru_cache(maxsize=4)
+def _access_token(client, username: str, password: str) -> str:
+    """Log in once per (client, user) and reuse the issued token."""
+    login_response = client.post("/auth/login", json={
+        "username": username,
+        "password": password
+    })
+    return login_response.json()["access_token"]
+
+
+def _json(response) -> Any:
+    """Decode a response body straight from its bytes."""
+    return _loads(response.content)
+
+
+@pytest.mark.parametrize("path,codes,expected_keys,expected_values,content_type", [
+    ("/", {200}, {"service", "version", "features"},
+     {"service": "Enhanced Risk Management API", "version": "2.0.0"}, None),
+    ("/api/v1/system/info", {200}, {"service", "version", "environment", "features", "data_sources"}, {}, None),
+    ("/health/liveness", {200}, set(), {}, None),
+    ("/health", {200, 503}, set(), {}, None),  # May fail if dependencies not available
+    ("/health/readiness", {200, 503}, set(), {}, None),
+    ("/metrics", {200, 503}, set(), {}, "text/plain"),  # Metrics or graceful failure
+])
+def test_get_contract(client, path, codes, expected_keys, expected_values, content_type):
+    """Test public GET endpoints return the expected status and payload shape."""
+    response = client.get(path)
+
+    assert response.status_code in codes
+
+    if response.status_code == 200:
+        if content_type:
+            assert content_type in response.headers.get("content-type", "")
+        if expected_keys or expected_values:
             data = response.json()
-            self.assertIn("portfolio_id", data)
-
-
-@pytest.mark.asyncio
-class TestAsyncRiskAPI:
-    """Async integration tests."""
-    
-    @pytest.fixture(autouse=True)
-    def setup_method(self):
-        """Setup for each test method."""
-        self.client = TestClient(app)
-    
-    async def test_concurrent_risk_calculations(self):
-        """Test multiple concurrent risk calculations."""
-        # Login
-        login_response = self.client.post("/auth/login", json={
-            "username": "test_user",
-            "password": "test_password"
-        })
-        token = login_response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Create multiple concurrent requests
-        portfolios = ["PORTFOLIO_1", "PORTFOLIO_2", "PORTFOLIO_3"]
-        
-        async with httpx.AsyncClient(app=app, base_url="http://test") as async_client:
-            # Prepare concurrent requests
-            tasks = []
-            for portfolio in portfolios:
-                request_data = {"portfolio_id": portfolio}
-                task = async_client.post(
-                    "/api/v1/risk/calculate",
-                    json=request_data,
-                    headers=headers
-                )
-                tasks.append(task)
-            
-            # Execute concurrently
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Validate responses
-            for i, response in enumerate(responses):
-                if isinstance(response, Exception):
-                    pytest.fail(f"Request {i} failed with exception: {response}")
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert data["portfolio_id"] == portfolios[i]
+            assert expected_keys <= data.keys()
+            for key, value in expected_values.items():
+                assert data[key] == value
+
+
+def test_login_development_mode(client):
+    """Test login in development mode."""
+    response = client.post("/auth/login", content=_LOGIN_BODY, headers=JSON_HEADERS)
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert "access_token" in data
+    assert "token_type" in data
+    assert "user" in data
+    assert data["token_type"] == "bearer"
+
+
+def test_portfolio_risk_calculation(client):
+    """Test portfolio risk calculation endpoint."""
+    # Test risk calculation
+    response = client.post(
+        "/api/v1/risk/calculate",
+        content=_RISK_BODY,
+        headers=JSON_HEADERS
+    )
+
+    assert response.status_code == 200
+    data = _json(response)
+
+    # Validate response structure
+    required_fields = [
+        "portfolio_id", "calculation_date", "var_95", "var_99",
+        "expected_shortfall", "volatility", "sharpe_ratio",
+        "max_drawdown", "beta", "alpha"
+    ]
+
+    missing = set(required_fields) - data.keys()
+    assert not missing, f"missing fields: {missing}"
+
+    # Validate data types and ranges
+    assert data["portfolio_id"] == "TEST_PORTFOLIO"
+    assert isinstance(data["var_95"], (int, float))
+    assert data["var_95"] >= 0
+    assert data["var_99"] >= data["var_95"]
+
+
+def test_stress_testing(client):
+    """Test stress testing endpoint."""
+    # Test stress test
+    response = client.post(
+        "/api/v1/risk/stress-test",
+        content=_STRESS_BODY,
+        headers=JSON_HEADERS
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert "portfolio_id" in data
+    assert "stress_test_results" in data
+    assert "calculated_at" in data
+
+    # Validate stress test results
+    stress_results = data["stress_test_results"]
+    assert isinstance(stress_results, dict)
+
+    for scenario in STRESS_SCENARIOS:
+        assert scenario in stress_results
+
+
+def test_market_data_endpoints(client):
+    """Test market data endpoints."""
+    # Test historical data
+    response = client.post(
+        "/api/v1/market-data/prices",
+        content=_MARKET_BODY,
+        headers=JSON_HEADERS
+    )
+
+    assert response.status_code == 200
+    data = _json(response)
+
+    assert "symbols" in data
+    assert "data_points" in data
+    assert "data" in data
+    assert data["symbols"] == ["AAPL", "MSFT"]
+
+    # Test latest price
+    response = client.get(
+        "/api/v1/market-data/latest/AAPL"
+    )
+
+    assert response.status_code == 200
+    data = _json(response)
+
+    assert "symbol" in data
+    assert "price" in data
+    assert "change" in data
+    assert data["symbol"] == "AAPL"
+
+
+@pytest.mark.parametrize("method,path,body,codes,list_key,item_keys", [
+    ("GET", "/api/v1/snowflake/warehouses", None, {200}, "warehouses", {"name", "state"}),
+    ("GET", "/api/v1/snowflake/databases", None, {200}, "databases", set()),
+    # May succeed or fail depending on mock implementation
+    ("POST", "/api/v1/snowflake/query", {"query": "SELECT 1 as test_column", "use_cache": False},
+     {200, 500, 503}, None, set()),
+])
+def test_snowflake_integration(client, method, path, body, codes, list_key, item_keys):
+    """Test Snowflake integration endpoints."""
+    response = client.request(method, path, json=body)
+
+    assert response.status_code in codes
+
+    if response.status_code == 200 and list_key:
+        data = _json(response)
+        assert isinstance(data[list_key], list)
+
+        if data[list_key]:
+            assert item_keys <= data[list_key][0].keys()
+
+
+def test_portfolio_management(client):
+    """Test portfolio management endpoints."""
+    # Test portfolio list
+    response = client.get(
+        "/api/v1/portfolios"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert "portfolios" in data
+    assert "count" in data
+    assert isinstance(data["portfolios"], list)
+    assert data["count"] >= 0
+
+
+def test_system_info_features(client):
+    """Test system information reports each feature flag as a boolean."""
+    response = client.get("/api/v1/system/info")
+
+    assert response.status_code == 200
+    features = response.json()["features"]
+    assert isinstance(features, dict)
+
+    expected_features = [
+        "snowflake_integration", "market_data_provider",
+        "risk_engine", "prometheus_metrics", "health_checks"
+    ]
+
+    missing = set(expected_features) - features.keys()
+    assert not missing, f"missing features: {missing}"
+    assert all(isinstance(features[feature], bool) for feature in expected_features)
+
+
+@pytest.mark.parametrize("headers,codes", [
+    (None, {403}),  # No token; or 401 depending on implementation
+    ({"Authorization": "Bearer invalid_token"}, {401, 403}),
+])
+def test_unauthorized_access(client, real_auth, headers, codes):
+    """Test that endpoints require authentication."""
+    response = client.post("/api/v1/risk/calculate", json={
+        "portfolio_id": "TEST"
+    }, headers=headers)
+
+    assert response.status_code in codes
+
+
+def test_token_grants_access(client, real_auth):
+    """Test that a token issued at login authorizes protected endpoints."""
+    token = _access_token(client, "test_user", "test_password")
+
+    response = client.get(
+        "/api/v1/portfolios",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path,body,codes", [
+    ("/api/v1/risk/calculate", {}, {422}),  # Missing portfolio_id
+    ("/api/v1/market-data/prices", {"symbols": ["AAPL"], "start_date": "invalid-date"},
+     {400, 422, 500}),  # Invalid date format, should handle gracefully
+])
+def test_bad_body_rejected(client, path, body, codes):
+    """Test input validation rejects malformed request bodies."""
+    response = client.post(path, json=body)
+
+    assert response.status_code in codes
+
+
+def test_error_handling(client):
+    """Test error handling and responses."""
+    # Test non-existent portfolio
+    response = client.post(
+        "/api/v1/risk/calculate",
+        json={"portfolio_id": "NON_EXISTENT_PORTFOLIO"}
+    )
+
+    # Should handle gracefully (may return empty results or 404)
+    assert response.status_code in [200, 404, 500]
+
+    if response.status_code == 200:
+        # If successful, should have valid structure
+        assert b'"portfolio_id"' in response.content
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.timeout(30)
+async def test_concurrent_risk_calculations(async_client):
+    """Test multiple concurrent risk calculations."""
+    # Create enough concurrent requests to saturate the limiter
+    portfolios = [f"PORTFOLIO_{i}" for i in range(1, 2 * MAX_CONCURRENT_REQUESTS + 1)]
+    responses = [None] * len(portfolios)
+
+    # Cap in-flight requests so larger portfolio lists don't fan out unbounded
+    limiter = anyio.CapacityLimiter(MAX_CONCURRENT_REQUESTS)
+
+    async def bounded_post(i: int, portfolio: str):
+        async with limiter:
+            responses[i] = await async_client.post(
+                "/api/v1/risk/calculate",
+                json={"portfolio_id": portfolio}
+            )
+
+    # Execute concurrently; any failed request cancels the rest and fails the test
+    async with anyio.create_task_group() as task_group:
+        for i, portfolio in enumerate(portfolios):
+            task_group.start_soon(bounded_post, i, portfolio)
+
+    # Validate responses
+    for i, response in enumerate(responses):
+        assert response.status_code == 200
+        data = response.json()
+        assert data["portfolio_id"] == portfolios[i]
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    pytest.main([__file__])
@@ -12,48 +12,210 @@ This script creates comprehensive visual diagrams for performance optimization i
 Generated diagrams help understand the complete performance optimization stack.
 """
 
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch, ConnectionPatch, Rectangle, Circle, Ellipse
+from matplotlib.patches import BoxStyle, FancyBboxPatch, Rectangle
+from matplotlib.artist import Artist
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
+from matplotlib.font_manager import FontProperties
 import numpy as np
 from pathlib import Path
 import os
-from datetime import datetime
+from functools import lru_cache
+import hashlib
+import inspect
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Set up matplotlib for better rendering
 plt.rcParams['figure.facecolor'] = 'white'
 plt.rcParams['axes.facecolor'] = 'white'
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = False
+# Write SVG labels as <text> elements instead of converting every glyph to a path
+plt.rcParams['svg.fonttype'] = 'none'
+plt.ioff()
 
-def create_fancy_box(ax, x, y, width, height, text, color, text_color='black', 
+# Arrowhead size in data units; heads grow slightly with line width
+ARROW_HEAD_LENGTH = 0.08
+ARROW_HEAD_WIDTH = 0.05
+
+# PNG resolution for docs; HIRES=1 restores print-quality 300 dpi output
+PNG_DPI = 300 if os.environ.get('HIRES') == '1' else 150
+# SVG_ONLY=1 skips PNG rasterization when only the vector output is consumed
+SVG_ONLY = os.environ.get('SVG_ONLY') == '1'
+
+def arrow_heads(segments, widths):
+    """Triangular heads at the end point of each (start, end) segment"""
+    direction = segments[:, 1] - segments[:, 0]
+    unit = direction / np.linalg.norm(direction, axis=1, keepdims=True)
+    normal = np.stack([-unit[:, 1], unit[:, 0]], axis=1)
+    scale = (1 + widths / 2)[:, None]
+    tips = segments[:, 1]
+    bases = tips - unit * ARROW_HEAD_LENGTH * scale
+    half_width = normal * ARROW_HEAD_WIDTH * scale
+    return np.stack([tips, bases + half_width, bases - half_width], axis=1)
+
+class LabelArtist(Artist):
+    """Centered box labels drawn as one artist sharing a font and graphics context"""
+    
+    def __init__(self, labels, fontsize=9, weight='bold', linespacing=1.2):
+        super().__init__()
+        # Sort by color so the graphics context changes once per color
+        self.labels = sorted(labels, key=lambda label: label[3])
+        self.prop = FontProperties(size=fontsize, weight=weight)
+        self.linespacing = linespacing
+        self.set_zorder(3)
+    
+    def draw(self, renderer):
+        if not self.get_visible() or not self.labels:
+            return
+        centers = self.get_transform().transform([(x, y) for x, y, _, _ in self.labels])
+        line_height = renderer.points_to_pixels(self.prop.get_size_in_points()) * self.linespacing
+        canvas_height = renderer.get_canvas_width_height()[1]
+        
+        renderer.open_group('labels', gid=self.get_gid())
+        gc = renderer.new_gc()
+        color = None
+        for (center_x, center_y), (_, _, text, text_color) in zip(centers, self.labels):
+            if text_color != color:
+                gc.set_foreground(text_color)
+                color = text_color
+            lines = text.split('\n')
+            top = center_y + line_height * (len(lines) - 1) / 2
+            for i, line in enumerate(lines):
+                width, height, descent = renderer.get_text_width_height_descent(
+                    line, self.prop, ismath=False)
+                x = center_x - width / 2
+                y = top - i * line_height - height / 2 + descent
+                if renderer.flipy():
+                    y = canvas_height - y
+                renderer.draw_text(gc, x, y, line, self.prop, 0)
+        gc.restore()
+        renderer.close_group('labels')
+        self.stale = False
+
+class DiagramBatch:
+    """Boxes, labels and arrows queued for one axes and added to it in batches"""
+    
+    def __init__(self, ax):
+        self.ax = ax
+        self.boxes = []
+        self.box_labels = []
+        self.arrows = []
+    
+    def draw(self):
+        """Add every queued box as one PatchCollection and every arrow as one LineCollection"""
+        # Axes limits are fixed up front, so collections skip data-limit updates
+        if self.boxes:
+            self.ax.add_collection(PatchCollection(self.boxes, match_original=True), autolim=False)
+        if self.box_labels:
+            self.ax.add_artist(LabelArtist(self.box_labels))
+        if self.arrows:
+            self._draw_arrows()
+        self.boxes.clear()
+        self.box_labels.clear()
+        self.arrows.clear()
+    
+    def _draw_arrows(self):
+        # Order by (color, width) so the backend changes line state once per group
+        arrows = sorted(self.arrows, key=lambda arrow: (arrow[2], arrow[3]))
+        segments = np.array([[start, end] for start, end, _, _, _ in arrows], dtype=float)
+        colors = [color for _, _, color, _, _ in arrows]
+        widths = np.array([width for _, _, _, width, _ in arrows], dtype=float)
+        self.ax.add_collection(LineCollection(segments, colors=colors, linewidths=widths),
+                               autolim=False)
+        
+        # Two-headed arrows get a second head at their start point
+        both = np.array([two_headed for _, _, _, _, two_headed in arrows])
+        head_segments = np.concatenate([segments, segments[both][:, ::-1]])
+        head_colors = colors + [color for color, two_headed in zip(colors, both) if two_headed]
+        head_widths = np.concatenate([widths, widths[both]])
+        self.ax.add_collection(PolyCollection(arrow_heads(head_segments, head_widths),
+                                              facecolors=head_colors, edgecolors=head_colors),
+                               autolim=False)
+
+@lru_cache(maxsize=32)
+def rounded_box_style(corner_radius):
+    """Shared BoxStyle for every box with the same corner radius"""
+    return BoxStyle("round", pad=0.01, rounding_size=corner_radius)
+
+def box_row(count, x, y, dx, dy, width, height):
+    """(count, 4) array of equal boxes stepping by (dx, dy) from (x, y)"""
+    origins = np.array([x, y]) + np.arange(count)[:, None] * np.array([dx, dy])
+    return np.column_stack([origins, np.broadcast_to([width, height], (count, 2))])
+
+def create_fancy_boxes(batch, coords, texts, color, text_color='black', 
+                       border_color='black', border_width=1, corner_radius=0.02):
+    """Queue fancy rounded boxes from an (N, 4) array of x, y, width, height"""
+    coords = np.asarray(coords, dtype=float)
+    centers = coords[:, :2] + coords[:, 2:] / 2
+    boxstyle = rounded_box_style(corner_radius)
+    # Unbox to Python floats once rather than creating NumPy scalars per field
+    for (x, y, width, height), (center_x, center_y), text in zip(coords.tolist(),
+                                                                 centers.tolist(), texts):
+        box = FancyBboxPatch((x, y), width, height, boxstyle=boxstyle,
+                            facecolor=color, edgecolor=border_color, linewidth=border_width,
+                            alpha=0.8)
+        batch.boxes.append(box)
+        batch.box_labels.append((center_x, center_y, text, text_color))
+
+def create_fancy_box(batch, x, y, width, height, text, color, text_color='black', 
                      border_color='black', border_width=1, corner_radius=0.02):
-    """Create a fancy rounded box with text"""
-    box = FancyBboxPatch((x, y), width, height,
-                        boxstyle=f"round,pad=0.01,rounding_size={corner_radius}",
-                        facecolor=color, edgecolor=border_color, linewidth=border_width,
-                        alpha=0.8)
-    ax.add_patch(box)
-    
-    # Add text
-    ax.text(x + width/2, y + height/2, text, ha='center', va='center', 
-            fontsize=9, color=text_color, weight='bold', wrap=True)
+    """Queue a fancy rounded box with text on the batch"""
+    create_fancy_boxes(batch, [[x, y, width, height]], [text], color, text_color,
+                       border_color, border_width, corner_radius)
+
+def create_arrow(batch, start_x, start_y, end_x, end_y, color='black', style='->', width=2):
+    """Queue an arrow between two points on the batch ('->' or '<->')"""
+    batch.arrows.append(((start_x, start_y), (end_x, end_y), color, width, style == '<->'))
+
+def arrow_fan(count, start, start_step, end, end_step):
+    """(count, 2) start and end points, each stepping by a fixed offset"""
+    steps = np.arange(count)[:, None]
+    return (np.asarray(start) + steps * np.asarray(start_step),
+            np.asarray(end) + steps * np.asarray(end_step))
+
+def create_arrows(batch, starts, ends, color='black', style='->', width=2):
+    """Queue one arrow per row of the (N, 2) starts and ends arrays"""
+    two_headed = style == '<->'
+    batch.arrows.extend((tuple(start), tuple(end), color, width, two_headed)
+                        for start, end in zip(starts.tolist(), ends.tolist()))
+
+def diagram_outputs(output_dir, name):
+    """Files written for one diagram"""
+    suffixes = ('svg',) if SVG_ONLY else ('png', 'svg')
+    return [output_dir / f"{name}.{suffix}" for suffix in suffixes]
 
-def create_arrow(ax, start_x, start_y, end_x, end_y, color='black', style='->', width=2):
-    """Create an arrow between two points"""
-    if style == '-->':
-        style = '-|>'
-    ax.annotate('', xy=(end_x, end_y), xytext=(start_x, start_y),
-                arrowprops=dict(arrowstyle=style, color=color, lw=width))
+def save_diagram(fig, output_dir, name, dpi=PNG_DPI):
+    """Save the figure as PNG and SVG, measuring its tight bounding box only once"""
+    # Lay out the artists without rasterizing a frame just to measure them
+    fig.draw_without_rendering()
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(plt.rcParams['savefig.pad_inches'])
+    if not SVG_ONLY:
+        fig.savefig(output_dir / f"{name}.png", dpi=dpi, bbox_inches=bbox)
+    fig.savefig(output_dir / f"{name}.svg", format='svg', bbox_inches=bbox)
+    fig.clear()
 
-def create_cache_architecture_diagram():
-    """Create Redis caching architecture diagram"""
+def diagram_hash_path(output_dir, name):
+    """Where the source hash of a rendered diagram is recorded"""
+    return output_dir / f".{name}.hash"
+
+def diagram_is_current(output_dir, name, source_hash):
+    """Check whether the rendered files exist and were built from the current source"""
+    hash_path = diagram_hash_path(output_dir, name)
+    outputs = diagram_outputs(output_dir, name) + [hash_path]
+    return all(path.exists() for path in outputs) and hash_path.read_text() == source_hash
+
+def create_cache_architecture_diagram(fig, output_dir):
+    """Create Redis caching architecture diagram on the shared figure"""
     
-    fig, ax = plt.subplots(1, 1, figsize=(16, 12))
-    ax.set_xlim(0, 16)
-    ax.set_ylim(0, 12)
-    ax.set_aspect('equal')
-    ax.axis('off')
+    fig.set_size_inches(16, 12)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set(xlim=(0, 16), ylim=(0, 12), aspect='equal')
+    ax.set_axis_off()
+    ax.use_sticky_edges = False
+    batch = DiagramBatch(ax)
     
     # Title
     ax.text(8, 11.5, 'Performance Optimization: Caching Architecture', 
@@ -83,20 +245,25 @@ def create_cache_architecture_diagram():
     
     # Individual Redis nodes
     redis_nodes = [
-        {'name': 'Redis Master\n(Primary)', 'x': 1.5, 'y': 9, 'width': 1.5, 'height': 0.8},
-        {'name': 'Redis Replica\n(Read)', 'x': 3.2, 'y': 9, 'width': 1.5, 'height': 0.8},
-        {'name': 'Redis Replica\n(Read)', 'x': 5, 'y': 9, 'width': 1.5, 'height': 0.8},
-        {'name': 'Redis Sentinel\n(Monitor)', 'x': 2.5, 'y': 7.8, 'width': 1.5, 'height': 0.8}
+        'Redis Master\n(Primary)',
+        'Redis Replica\n(Read)',
+        'Redis Replica\n(Read)',
+        'Redis Sentinel\n(Monitor)'
     ]
+    redis_nodes_coords = np.array([
+        [1.5, 9, 1.5, 0.8],
+        [3.2, 9, 1.5, 0.8],
+        [5, 9, 1.5, 0.8],
+        [2.5, 7.8, 1.5, 0.8]
+    ])
     
-    for node in redis_nodes:
-        create_fancy_box(ax, node['x'], node['y'], node['width'], node['height'], 
-                        node['name'], colors['redis'], 'white', 'darkred', 2)
+    create_fancy_boxes(batch, redis_nodes_coords, redis_nodes, 
+                       colors['redis'], 'white', 'darkred', 2)
     
     # Connection lines between Redis nodes
-    create_arrow(ax, 2.8, 9.4, 3.8, 9.4, 'darkred', '<->', 1)
-    create_arrow(ax, 4.5, 9.4, 5.5, 9.4, 'darkred', '<->', 1)
-    create_arrow(ax, 3.2, 8.6, 3.2, 8.2, 'darkred', '<->', 1)
+    create_arrow(batch, 2.8, 9.4, 3.8, 9.4, 'darkred', '<->', 1)
+    create_arrow(batch, 4.5, 9.4, 5.5, 9.4, 'darkred', '<->', 1)
+    create_arrow(batch, 3.2, 8.6, 3.2, 8.2, 'darkred', '<->', 1)
     
     # Application Layer
     app_layer_rect = Rectangle((8.5, 7), 6, 3.5, linewidth=2, 
@@ -106,48 +273,49 @@ def create_cache_architecture_diagram():
     
     # Application services
     app_services = [
-        {'name': 'Risk API\n(Optimized)', 'x': 9, 'y': 9, 'width': 2, 'height': 0.8},
-        {'name': 'Cache Manager\nLibrary', 'x': 11.5, 'y': 9, 'width': 2, 'height': 0.8},
-        {'name': 'Performance\nProfiler', 'x': 9, 'y': 7.8, 'width': 2, 'height': 0.8},
-        {'name': 'Load Balancer\n(HAProxy)', 'x': 11.5, 'y': 7.8, 'width': 2, 'height': 0.8}
+        'Risk API\n(Optimized)',
+        'Cache Manager\nLibrary',
+        'Performance\nProfiler',
+        'Load Balancer\n(HAProxy)'
     ]
+    app_services_coords = np.array([
+        [9, 9, 2, 0.8],
+        [11.5, 9, 2, 0.8],
+        [9, 7.8, 2, 0.8],
+        [11.5, 7.8, 2, 0.8]
+    ])
     
-    for service in app_services:
-        create_fancy_box(ax, service['x'], service['y'], service['width'], service['height'], 
-                        service['name'], colors['app'], 'white', 'darkorange', 2)
+    create_fancy_boxes(batch, app_services_coords, app_services, 
+                       colors['app'], 'white', 'darkorange', 2)
     
     # Database Layer
-    create_fancy_box(ax, 2, 4.5, 4, 1.5, 'PostgreSQL\nDatabase\n(Connection Pool)', 
+    create_fancy_box(batch, 2, 4.5, 4, 1.5, 'PostgreSQL\nDatabase\n(Connection Pool)', 
                     colors['database'], 'white', 'teal', 2)
     
     # Monitoring Layer
-    monitoring_services = [
-        {'name': 'Prometheus\nMetrics', 'x': 8.5, 'y': 4.5, 'width': 2, 'height': 1.5},
-        {'name': 'Grafana\nDashboards', 'x': 11, 'y': 4.5, 'width': 2, 'height': 1.5},
-        {'name': 'Performance\nReporter', 'x': 13.5, 'y': 4.5, 'width': 2, 'height': 1.5}
-    ]
+    monitoring_services = ['Prometheus\nMetrics', 'Grafana\nDashboards', 'Performance\nReporter']
+    monitoring_services_coords = box_row(3, 8.5, 4.5, 2.5, 0, 2, 1.5)
     
-    for service in monitoring_services:
-        create_fancy_box(ax, service['x'], service['y'], service['width'], service['height'], 
-                        service['name'], colors['monitoring'], 'white', 'darkblue', 2)
+    create_fancy_boxes(batch, monitoring_services_coords, monitoring_services, 
+                       colors['monitoring'], 'white', 'darkblue', 2)
     
     # Cache Hit/Miss Flow
-    create_fancy_box(ax, 1, 2, 14, 1.5, 
+    create_fancy_box(batch, 1, 2, 14, 1.5, 
                     'Cache Flow: Request → Cache Check → Hit (Return) / Miss (Database + Cache Update)', 
                     colors['cache_layer'], 'black', 'goldenrod', 2)
     
     # Connection arrows
     # App to Redis
-    create_arrow(ax, 8.5, 9.4, 7, 9.4, 'blue', '->', 3)
+    create_arrow(batch, 8.5, 9.4, 7, 9.4, 'blue', '->', 3)
     ax.text(7.75, 9.6, 'Cache\nRequests', ha='center', fontsize=8, color='blue')
     
     # App to Database (cache miss)
-    create_arrow(ax, 9.5, 7.8, 5, 5.8, 'green', '->', 2)
+    create_arrow(batch, 9.5, 7.8, 5, 5.8, 'green', '->', 2)
     ax.text(7, 6.5, 'Cache Miss\nDB Query', ha='center', fontsize=8, color='green')
     
     # Monitoring connections
-    create_arrow(ax, 10, 7, 10, 6, 'purple', '->', 2)
-    create_arrow(ax, 12, 7, 12, 6, 'purple', '->', 2)
+    create_arrow(batch, 10, 7, 10, 6, 'purple', '->', 2)
+    create_arrow(batch, 12, 7, 12, 6, 'purple', '->', 2)
     
     # Performance metrics
     metrics_text = (
@@ -163,28 +331,35 @@ def create_cache_architecture_diagram():
     ax.text(0.5, 1.5, metrics_text, fontsize=9, va='top', ha='left', 
             bbox=dict(boxstyle="round,pad=0.3", facecolor='lightyellow', alpha=0.8))
     
-    # Save diagram
-    output_dir = Path("docs/architecture")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    batch.draw()
+    fig.tight_layout()
     
-    plt.tight_layout()
-    plt.savefig(output_dir / "performance_caching_architecture.png", dpi=300, bbox_inches='tight')
-    plt.savefig(output_dir / "performance_caching_architecture.svg", format='svg', bbox_inches='tight')
-    plt.close()
+    # Save diagram
+    save_diagram(fig, output_dir, "performance_caching_architecture")
 
-def create_performance_monitoring_diagram():
-    """Create performance monitoring and benchmarking diagram"""
-    
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
+def create_performance_monitoring_diagram(fig, output_dir):
+    """Create performance monitoring and benchmarking diagram on the shared figure"""
+    
+    fig.set_size_inches(20, 16)
+    axes = fig.subplots(2, 2)
+    (ax1, ax2), (ax3, ax4) = axes
+    
+    # Scaffold shared by all four quadrants: a 10x8 canvas without axes and a title
+    quadrant_titles = (
+        'Performance Monitoring Architecture',
+        'Load Testing & Benchmarking Framework',
+        'Database Performance Optimization',
+        'API Performance Optimization Patterns',
+    )
+    for ax, title in zip(axes.flat, quadrant_titles):
+        ax.set(xlim=(0, 10), ylim=(0, 8), aspect='equal')
+        ax.set_axis_off()
+        ax.use_sticky_edges = False
+        ax.text(5, 7.5, title, fontsize=14, fontweight='bold', ha='center')
+    batches = [DiagramBatch(ax) for ax in axes.flat]
+    batch1, batch2, batch3, batch4 = batches
     
     # Performance Monitoring Architecture (ax1)
-    ax1.set_xlim(0, 10)
-    ax1.set_ylim(0, 8)
-    ax1.set_aspect('equal')
-    ax1.axis('off')
-    ax1.text(5, 7.5, 'Performance Monitoring Architecture', 
-             fontsize=14, fontweight='bold', ha='center')
-    
     colors = {
         'collection': '#FF6B6B',
         'processing': '#4ECDC4', 
@@ -195,156 +370,129 @@ def create_performance_monitoring_diagram():
     
     # Data collection layer
     collection_services = [
-        {'name': 'Application\nMetrics', 'x': 0.5, 'y': 6, 'width': 1.8, 'height': 1},
-        {'name': 'System\nMetrics', 'x': 2.5, 'y': 6, 'width': 1.8, 'height': 1},
-        {'name': 'Cache\nMetrics', 'x': 4.5, 'y': 6, 'width': 1.8, 'height': 1},
-        {'name': 'Database\nMetrics', 'x': 6.5, 'y': 6, 'width': 1.8, 'height': 1}
+        'Application\nMetrics',
+        'System\nMetrics',
+        'Cache\nMetrics',
+        'Database\nMetrics'
     ]
+    collection_services_coords = box_row(4, 0.5, 6, 2, 0, 1.8, 1)
     
-    for service in collection_services:
-        create_fancy_box(ax1, service['x'], service['y'], service['width'], service['height'], 
-                        service['name'], colors['collection'], 'white', 'darkred', 2)
+    create_fancy_boxes(batch1, collection_services_coords, collection_services, 
+                       colors['collection'], 'white', 'darkred', 2)
     
     # Processing layer
-    create_fancy_box(ax1, 2, 4.2, 6, 1, 'Performance Profiler & Analyzer', 
+    create_fancy_box(batch1, 2, 4.2, 6, 1, 'Performance Profiler & Analyzer', 
                     colors['processing'], 'white', 'teal', 2)
     
     # Storage layer
-    storage_services = [
-        {'name': 'Prometheus\nTSDB', 'x': 1, 'y': 2.5, 'width': 2, 'height': 1},
-        {'name': 'Time Series\nStorage', 'x': 3.5, 'y': 2.5, 'width': 2, 'height': 1},
-        {'name': 'Benchmark\nResults', 'x': 6, 'y': 2.5, 'width': 2, 'height': 1}
-    ]
+    storage_services = ['Prometheus\nTSDB', 'Time Series\nStorage', 'Benchmark\nResults']
+    storage_services_coords = box_row(3, 1, 2.5, 2.5, 0, 2, 1)
     
-    for service in storage_services:
-        create_fancy_box(ax1, service['x'], service['y'], service['width'], service['height'], 
-                        service['name'], colors['storage'], 'white', 'darkblue', 2)
+    create_fancy_boxes(batch1, storage_services_coords, storage_services, 
+                       colors['storage'], 'white', 'darkblue', 2)
     
     # Visualization and alerting
-    create_fancy_box(ax1, 1, 0.5, 3, 1, 'Grafana Dashboards', 
+    create_fancy_box(batch1, 1, 0.5, 3, 1, 'Grafana Dashboards', 
                     colors['visualization'], 'black', 'goldenrod', 2)
-    create_fancy_box(ax1, 5, 0.5, 3, 1, 'Alert Manager', 
+    create_fancy_box(batch1, 5, 0.5, 3, 1, 'Alert Manager', 
                     colors['alerting'], 'white', 'darkmagenta', 2)
     
     # Connection arrows
-    for i in range(4):
-        create_arrow(ax1, 1.4 + i*2, 6, 3.5 + i*0.5, 5.2, 'blue', '->', 1)
+    create_arrows(batch1, *arrow_fan(4, (1.4, 6), (2, 0), (3.5, 5.2), (0.5, 0)), 'blue', '->', 1)
     
-    create_arrow(ax1, 5, 4.2, 3, 3.5, 'green', '->', 2)
-    create_arrow(ax1, 5, 4.2, 5, 3.5, 'green', '->', 2)
-    create_arrow(ax1, 5, 4.2, 7, 3.5, 'green', '->', 2)
+    create_arrow(batch1, 5, 4.2, 3, 3.5, 'green', '->', 2)
+    create_arrow(batch1, 5, 4.2, 5, 3.5, 'green', '->', 2)
+    create_arrow(batch1, 5, 4.2, 7, 3.5, 'green', '->', 2)
     
-    create_arrow(ax1, 2.5, 2.5, 2.5, 1.5, 'purple', '->', 2)
-    create_arrow(ax1, 6.5, 2.5, 6.5, 1.5, 'red', '->', 2)
+    create_arrow(batch1, 2.5, 2.5, 2.5, 1.5, 'purple', '->', 2)
+    create_arrow(batch1, 6.5, 2.5, 6.5, 1.5, 'red', '->', 2)
     
     # Load Testing Framework (ax2)
-    ax2.set_xlim(0, 10)
-    ax2.set_ylim(0, 8)
-    ax2.set_aspect('equal')
-    ax2.axis('off')
-    ax2.text(5, 7.5, 'Load Testing & Benchmarking Framework', 
-             fontsize=14, fontweight='bold', ha='center')
-    
     # Load testing components
-    create_fancy_box(ax2, 1, 6, 8, 0.8, 'Load Testing Controller (Python)', '#FF6B6B', 'white', 'darkred', 2)
+    create_fancy_box(batch2, 1, 6, 8, 0.8, 'Load Testing Controller (Python)', '#FF6B6B', 'white', 'darkred', 2)
     
     # Test scenarios
-    scenarios = [
-        {'name': 'Concurrent\nUsers', 'x': 0.5, 'y': 4.5, 'width': 1.8, 'height': 1},
-        {'name': 'API\nEndpoints', 'x': 2.5, 'y': 4.5, 'width': 1.8, 'height': 1},
-        {'name': 'Database\nQueries', 'x': 4.5, 'y': 4.5, 'width': 1.8, 'height': 1},
-        {'name': 'Cache\nOperations', 'x': 6.5, 'y': 4.5, 'width': 1.8, 'height': 1}
-    ]
+    scenarios = ['Concurrent\nUsers', 'API\nEndpoints', 'Database\nQueries', 'Cache\nOperations']
+    scenarios_coords = box_row(4, 0.5, 4.5, 2, 0, 1.8, 1)
     
-    for scenario in scenarios:
-        create_fancy_box(ax2, scenario['x'], scenario['y'], scenario['width'], scenario['height'], 
-                        scenario['name'], '#4ECDC4', 'white', 'teal', 2)
+    create_fancy_boxes(batch2, scenarios_coords, scenarios, 
+                       '#4ECDC4', 'white', 'teal', 2)
     
     # Results processing
-    create_fancy_box(ax2, 2, 2.8, 6, 1, 'Benchmark Suite & Statistical Analysis', 
+    create_fancy_box(batch2, 2, 2.8, 6, 1, 'Benchmark Suite & Statistical Analysis', 
                     '#45B7D1', 'white', 'darkblue', 2)
     
     # Reporting
-    create_fancy_box(ax2, 1, 1, 8, 1, 'Performance Reports & Dashboards', 
+    create_fancy_box(batch2, 1, 1, 8, 1, 'Performance Reports & Dashboards', 
                     '#FFE66D', 'black', 'goldenrod', 2)
     
     # Arrows
-    create_arrow(ax2, 5, 6, 5, 5.5, 'blue', '->', 2)
-    for i in range(4):
-        create_arrow(ax2, 1.4 + i*2, 4.5, 3.5 + i*0.5, 3.8, 'green', '->', 1)
-    create_arrow(ax2, 5, 2.8, 5, 2, 'purple', '->', 2)
+    create_arrow(batch2, 5, 6, 5, 5.5, 'blue', '->', 2)
+    create_arrows(batch2, *arrow_fan(4, (1.4, 4.5), (2, 0), (3.5, 3.8), (0.5, 0)), 'green', '->', 1)
+    create_arrow(batch2, 5, 2.8, 5, 2, 'purple', '->', 2)
     
     # Database Optimization (ax3)
-    ax3.set_xlim(0, 10)
-    ax3.set_ylim(0, 8)
-    ax3.set_aspect('equal')
-    ax3.axis('off')
-    ax3.text(5, 7.5, 'Database Performance Optimization', 
-             fontsize=14, fontweight='bold', ha='center')
-    
     # Connection pool
-    create_fancy_box(ax3, 1, 5.5, 8, 1.2, 'Database Connection Pool Manager\n(SQLAlchemy + pgbouncer)', 
+    create_fancy_box(batch3, 1, 5.5, 8, 1.2, 'Database Connection Pool Manager\n(SQLAlchemy + pgbouncer)', 
                     '#4ECDC4', 'white', 'teal', 2)
     
     # Optimization techniques
     optimizations = [
-        {'name': 'Query\nOptimization', 'x': 0.5, 'y': 3.8, 'width': 2, 'height': 1},
-        {'name': 'Index\nManagement', 'x': 2.8, 'y': 3.8, 'width': 2, 'height': 1},
-        {'name': 'Connection\nPooling', 'x': 5.1, 'y': 3.8, 'width': 2, 'height': 1},
-        {'name': 'Query\nCaching', 'x': 7.4, 'y': 3.8, 'width': 2, 'height': 1}
+        'Query\nOptimization',
+        'Index\nManagement',
+        'Connection\nPooling',
+        'Query\nCaching'
     ]
+    optimizations_coords = box_row(4, 0.5, 3.8, 2.3, 0, 2, 1)
     
-    for opt in optimizations:
-        create_fancy_box(ax3, opt['x'], opt['y'], opt['width'], opt['height'], 
-                        opt['name'], '#45B7D1', 'white', 'darkblue', 2)
+    create_fancy_boxes(batch3, optimizations_coords, optimizations, 
+                       '#45B7D1', 'white', 'darkblue', 2)
     
     # Database instances
-    create_fancy_box(ax3, 2, 2, 2.5, 1, 'Primary DB\n(Read/Write)', '#FF6B6B', 'white', 'darkred', 2)
-    create_fancy_box(ax3, 5.5, 2, 2.5, 1, 'Read Replica\n(Read Only)', '#FFE66D', 'black', 'goldenrod', 2)
+    create_fancy_box(batch3, 2, 2, 2.5, 1, 'Primary DB\n(Read/Write)', '#FF6B6B', 'white', 'darkred', 2)
+    create_fancy_box(batch3, 5.5, 2, 2.5, 1, 'Read Replica\n(Read Only)', '#FFE66D', 'black', 'goldenrod', 2)
     
     # Monitoring
-    create_fancy_box(ax3, 3, 0.5, 4, 0.8, 'Performance Monitoring & Alerts', 
+    create_fancy_box(batch3, 3, 0.5, 4, 0.8, 'Performance Monitoring & Alerts', 
                     '#FF8C94', 'white', 'darkmagenta', 2)
     
     # API Performance Patterns (ax4)
-    ax4.set_xlim(0, 10)
-    ax4.set_ylim(0, 8)
-    ax4.set_aspect('equal')
-    ax4.axis('off')
-    ax4.text(5, 7.5, 'API Performance Optimization Patterns', 
-             fontsize=14, fontweight='bold', ha='center')
-    
     # Request flow
     flow_components = [
-        {'name': 'Client\nRequest', 'x': 0.5, 'y': 6, 'width': 1.5, 'height': 0.8},
-        {'name': 'Load\nBalancer', 'x': 2.5, 'y': 6, 'width': 1.5, 'height': 0.8},
-        {'name': 'API\nGateway', 'x': 4.5, 'y': 6, 'width': 1.5, 'height': 0.8},
-        {'name': 'Cache\nLayer', 'x': 6.5, 'y': 6, 'width': 1.5, 'height': 0.8},
-        {'name': 'API\nService', 'x': 8.2, 'y': 6, 'width': 1.5, 'height': 0.8}
+        'Client\nRequest',
+        'Load\nBalancer',
+        'API\nGateway',
+        'Cache\nLayer',
+        'API\nService'
     ]
+    flow_components_coords = np.array([
+        [0.5, 6, 1.5, 0.8],
+        [2.5, 6, 1.5, 0.8],
+        [4.5, 6, 1.5, 0.8],
+        [6.5, 6, 1.5, 0.8],
+        [8.2, 6, 1.5, 0.8]
+    ])
     
-    for comp in flow_components:
-        create_fancy_box(ax4, comp['x'], comp['y'], comp['width'], comp['height'], 
-                        comp['name'], '#FF6B6B', 'white', 'darkred', 2)
+    create_fancy_boxes(batch4, flow_components_coords, flow_components, 
+                       '#FF6B6B', 'white', 'darkred', 2)
     
     # Arrows for request flow
-    for i in range(4):
-        create_arrow(ax4, 2 + i*2, 6.4, 2.5 + i*2, 6.4, 'blue', '->', 2)
+    create_arrows(batch4, *arrow_fan(4, (2, 6.4), (2, 0), (2.5, 6.4), (2, 0)), 'blue', '->', 2)
     
     # Optimization techniques
     optimizations = [
-        {'name': 'Async\nProcessing', 'x': 1, 'y': 4, 'width': 1.8, 'height': 1},
-        {'name': 'Response\nCompression', 'x': 3, 'y': 4, 'width': 1.8, 'height': 1},
-        {'name': 'Request\nBatching', 'x': 5, 'y': 4, 'width': 1.8, 'height': 1},
-        {'name': 'Circuit\nBreaker', 'x': 7, 'y': 4, 'width': 1.8, 'height': 1}
+        'Async\nProcessing',
+        'Response\nCompression',
+        'Request\nBatching',
+        'Circuit\nBreaker'
     ]
+    optimizations_coords = box_row(4, 1, 4, 2, 0, 1.8, 1)
     
-    for opt in optimizations:
-        create_fancy_box(ax4, opt['x'], opt['y'], opt['width'], opt['height'], 
-                        opt['name'], '#4ECDC4', 'white', 'teal', 2)
+    create_fancy_boxes(batch4, optimizations_coords, optimizations, 
+                       '#4ECDC4', 'white', 'teal', 2)
     
     # Metrics display
-    create_fancy_box(ax4, 1, 2, 8, 1.2, 
+    create_fancy_box(batch4, 1, 2, 8, 1.2, 
                     'Performance Metrics: Response Time <200ms | Throughput >1000 RPS | Error Rate <0.1%', 
                     '#FFE66D', 'black', 'goldenrod', 2)
     
@@ -363,24 +511,22 @@ def create_performance_monitoring_diagram():
     ax4.text(0.5, 1, targets_text, fontsize=8, va='top', ha='left', 
             bbox=dict(boxstyle="round,pad=0.3", facecolor='lightgreen', alpha=0.8))
     
-    plt.tight_layout()
+    for batch in batches:
+        batch.draw()
+    fig.tight_layout()
     
     # Save diagram
-    output_dir = Path("docs/architecture")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    plt.savefig(output_dir / "performance_monitoring_optimization.png", dpi=300, bbox_inches='tight')
-    plt.savefig(output_dir / "performance_monitoring_optimization.svg", format='svg', bbox_inches='tight')
-    plt.close()
+    save_diagram(fig, output_dir, "performance_monitoring_optimization")
 
-def create_async_processing_diagram():
-    """Create async processing and task management diagram"""
+def create_async_processing_diagram(fig, output_dir):
+    """Create async processing and task management diagram on the shared figure"""
     
-    fig, ax = plt.subplots(1, 1, figsize=(16, 10))
-    ax.set_xlim(0, 16)
-    ax.set_ylim(0, 10)
-    ax.set_aspect('equal')
-    ax.axis('off')
+    fig.set_size_inches(16, 10)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set(xlim=(0, 16), ylim=(0, 10), aspect='equal')
+    ax.set_axis_off()
+    ax.use_sticky_edges = False
+    batch = DiagramBatch(ax)
     
     # Title
     ax.text(8, 9.5, 'Async Processing & Task Management Architecture', 
@@ -395,19 +541,15 @@ def create_async_processing_diagram():
     }
     
     # Async Task Manager
-    create_fancy_box(ax, 1, 7.5, 4, 1.5, 'Async Task Manager\n(Background Processing)', 
+    create_fancy_box(batch, 1, 7.5, 4, 1.5, 'Async Task Manager\n(Background Processing)', 
                     colors['async_manager'], 'white', 'darkred', 2)
     
     # Task Queues
-    queue_types = [
-        {'name': 'High Priority\nQueue', 'x': 6.5, 'y': 8, 'width': 2, 'height': 0.8},
-        {'name': 'Normal Priority\nQueue', 'x': 6.5, 'y': 7, 'width': 2, 'height': 0.8},
-        {'name': 'Low Priority\nQueue', 'x': 6.5, 'y': 6, 'width': 2, 'height': 0.8}
-    ]
+    queue_types = ['High Priority\nQueue', 'Normal Priority\nQueue', 'Low Priority\nQueue']
+    queue_types_coords = box_row(3, 6.5, 8, 0, -1, 2, 0.8)
     
-    for queue in queue_types:
-        create_fancy_box(ax, queue['x'], queue['y'], queue['width'], queue['height'], 
-                        queue['name'], colors['task_queue'], 'white', 'teal', 2)
+    create_fancy_boxes(batch, queue_types_coords, queue_types, 
+                       colors['task_queue'], 'white', 'teal', 2)
     
     # Worker Pool
     worker_rect = Rectangle((10, 5.5), 5, 3.5, linewidth=2, 
@@ -417,72 +559,113 @@ def create_async_processing_diagram():
     
     # Individual workers
     workers = [
-        {'name': 'Risk Calc\nWorker', 'x': 10.5, 'y': 7.8, 'width': 1.8, 'height': 0.7},
-        {'name': 'Data Proc\nWorker', 'x': 12.7, 'y': 7.8, 'width': 1.8, 'height': 0.7},
-        {'name': 'Report Gen\nWorker', 'x': 10.5, 'y': 6.8, 'width': 1.8, 'height': 0.7},
-        {'name': 'Cache Warm\nWorker', 'x': 12.7, 'y': 6.8, 'width': 1.8, 'height': 0.7},
-        {'name': 'Monitor\nWorker', 'x': 11.6, 'y': 5.8, 'width': 1.8, 'height': 0.7}
+        'Risk Calc\nWorker',
+        'Data Proc\nWorker',
+        'Report Gen\nWorker',
+        'Cache Warm\nWorker',
+        'Monitor\nWorker'
     ]
+    workers_coords = np.array([
+        [10.5, 7.8, 1.8, 0.7],
+        [12.7, 7.8, 1.8, 0.7],
+        [10.5, 6.8, 1.8, 0.7],
+        [12.7, 6.8, 1.8, 0.7],
+        [11.6, 5.8, 1.8, 0.7]
+    ])
     
-    for worker in workers:
-        create_fancy_box(ax, worker['x'], worker['y'], worker['width'], worker['height'], 
-                        worker['name'], colors['workers'], 'white', 'darkblue', 2)
+    create_fancy_boxes(batch, workers_coords, workers, 
+                       colors['workers'], 'white', 'darkblue', 2)
     
     # Task Types
     task_types = [
-        {'name': 'Portfolio Risk\nCalculation', 'x': 1, 'y': 5, 'width': 2.5, 'height': 1},
-        {'name': 'Market Data\nRefresh', 'x': 4, 'y': 5, 'width': 2.5, 'height': 1},
-        {'name': 'Performance\nMonitoring', 'x': 1, 'y': 3.5, 'width': 2.5, 'height': 1},
-        {'name': 'Cache\nWarmup', 'x': 4, 'y': 3.5, 'width': 2.5, 'height': 1}
+        'Portfolio Risk\nCalculation',
+        'Market Data\nRefresh',
+        'Performance\nMonitoring',
+        'Cache\nWarmup'
     ]
+    task_types_coords = np.array([
+        [1, 5, 2.5, 1],
+        [4, 5, 2.5, 1],
+        [1, 3.5, 2.5, 1],
+        [4, 3.5, 2.5, 1]
+    ])
     
-    for task in task_types:
-        create_fancy_box(ax, task['x'], task['y'], task['width'], task['height'], 
-                        task['name'], colors['monitoring'], 'black', 'goldenrod', 2)
+    create_fancy_boxes(batch, task_types_coords, task_types, 
+                       colors['monitoring'], 'black', 'goldenrod', 2)
     
     # Result Storage
-    create_fancy_box(ax, 10.5, 3, 4, 1.5, 'Result Storage\n(Redis + Database)', 
+    create_fancy_box(batch, 10.5, 3, 4, 1.5, 'Result Storage\n(Redis + Database)', 
                     colors['storage'], 'white', 'darkmagenta', 2)
     
     # Monitoring & Metrics
-    create_fancy_box(ax, 1, 1.5, 6, 1.5, 
+    create_fancy_box(batch, 1, 1.5, 6, 1.5, 
                     'Task Monitoring: Queue Length, Processing Time, Success Rate, Error Tracking', 
                     colors['monitoring'], 'black', 'goldenrod', 2)
     
-    create_fancy_box(ax, 8.5, 1.5, 6, 1.5, 
+    create_fancy_box(batch, 8.5, 1.5, 6, 1.5, 
                     'Performance Metrics: Throughput, Latency, Resource Usage, Scaling Events', 
                     colors['monitoring'], 'black', 'goldenrod', 2)
     
     # Connection arrows
     # Task Manager to Queues
-    create_arrow(ax, 5, 8.2, 6.5, 8.4, 'blue', '->', 2)
-    create_arrow(ax, 5, 8, 6.5, 7.4, 'blue', '->', 2)
-    create_arrow(ax, 5, 7.8, 6.5, 6.4, 'blue', '->', 2)
+    create_arrow(batch, 5, 8.2, 6.5, 8.4, 'blue', '->', 2)
+    create_arrow(batch, 5, 8, 6.5, 7.4, 'blue', '->', 2)
+    create_arrow(batch, 5, 7.8, 6.5, 6.4, 'blue', '->', 2)
     
     # Queues to Workers
-    create_arrow(ax, 8.5, 8.4, 10.5, 8.1, 'green', '->', 2)
-    create_arrow(ax, 8.5, 7.4, 11.4, 7.5, 'green', '->', 2)
-    create_arrow(ax, 8.5, 6.4, 12.2, 6.5, 'green', '->', 2)
+    create_arrow(batch, 8.5, 8.4, 10.5, 8.1, 'green', '->', 2)
+    create_arrow(batch, 8.5, 7.4, 11.4, 7.5, 'green', '->', 2)
+    create_arrow(batch, 8.5, 6.4, 12.2, 6.5, 'green', '->', 2)
     
     # Tasks to Task Manager
-    create_arrow(ax, 2.2, 5, 2.8, 7.5, 'purple', '->', 2)
-    create_arrow(ax, 5.2, 5, 3.2, 7.5, 'purple', '->', 2)
-    create_arrow(ax, 2.2, 3.5, 2.4, 7.5, 'purple', '->', 2)
-    create_arrow(ax, 5.2, 3.5, 3.6, 7.5, 'purple', '->', 2)
+    create_arrow(batch, 2.2, 5, 2.8, 7.5, 'purple', '->', 2)
+    create_arrow(batch, 5.2, 5, 3.2, 7.5, 'purple', '->', 2)
+    create_arrow(batch, 2.2, 3.5, 2.4, 7.5, 'purple', '->', 2)
+    create_arrow(batch, 5.2, 3.5, 3.6, 7.5, 'purple', '->', 2)
     
     # Workers to Storage
-    create_arrow(ax, 11.4, 6.8, 11.8, 4.5, 'orange', '->', 2)
-    create_arrow(ax, 13.1, 6.8, 12.8, 4.5, 'orange', '->', 2)
+    create_arrow(batch, 11.4, 6.8, 11.8, 4.5, 'orange', '->', 2)
+    create_arrow(batch, 13.1, 6.8, 12.8, 4.5, 'orange', '->', 2)
     
-    plt.tight_layout()
+    batch.draw()
+    fig.tight_layout()
     
     # Save diagram
-    output_dir = Path("docs/architecture")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    plt.savefig(output_dir / "async_processing_architecture.png", dpi=300, bbox_inches='tight')
-    plt.savefig(output_dir / "async_processing_architecture.svg", format='svg', bbox_inches='tight')
-    plt.close()
+    save_diagram(fig, output_dir, "async_processing_architecture")
+
+# (label, output file stem, builder) for every diagram this script renders
+DIAGRAMS = (
+    ("caching architecture", "performance_caching_architecture", create_cache_architecture_diagram),
+    ("performance monitoring", "performance_monitoring_optimization", create_performance_monitoring_diagram),
+    ("async processing", "async_processing_architecture", create_async_processing_diagram),
+)
+
+# Everything besides the builder itself that determines how a diagram looks
+RENDERING_HELPERS = (
+    arrow_heads, LabelArtist, DiagramBatch, rounded_box_style, box_row,
+    create_fancy_boxes, create_fancy_box, create_arrow, arrow_fan, create_arrows,
+    diagram_outputs, save_diagram,
+)
+
+def diagram_source_hash(create_diagram):
+    """Hash of the builder and rendering helper sources plus the active style settings"""
+    digest = hashlib.blake2b(digest_size=8)
+    for obj in (create_diagram, *RENDERING_HELPERS):
+        digest.update(inspect.getsource(obj).encode())
+    settings = (ARROW_HEAD_LENGTH, ARROW_HEAD_WIDTH, PNG_DPI, SVG_ONLY, sorted(plt.rcParams.items()))
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()
+
+# Figure reused by every diagram a worker process renders
+_figure = None
+
+def _render_diagram(create_diagram, output_dir):
+    """Render one diagram on this process's figure (ProcessPoolExecutor worker)"""
+    global _figure
+    if _figure is None:
+        with plt.ioff():
+            _figure = plt.figure()
+    create_diagram(_figure, output_dir)
 
 def main():
     """Generate all performance optimization diagrams"""
@@ -490,27 +673,38 @@ def main():
     print("Generating Performance Optimization Architecture Diagrams...")
     
     try:
-        # Create output directory
+        # Create output directory once; the diagram builders only write into it
         output_dir = Path("docs/architecture")
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        print("Creating caching architecture diagram...")
-        create_cache_architecture_diagram()
-        
-        print("Creating performance monitoring diagram...")
-        create_performance_monitoring_diagram()
+        # Diagrams rendered from unchanged source are skipped
+        pending = []
+        for label, name, create_diagram in DIAGRAMS:
+            source_hash = diagram_source_hash(create_diagram)
+            if diagram_is_current(output_dir, name, source_hash):
+                print(f"Skipping {label} diagram (up to date)...")
+            else:
+                pending.append((label, name, create_diagram, source_hash))
         
-        print("Creating async processing diagram...")
-        create_async_processing_diagram()
+        # Rasterization is CPU-bound, so each diagram renders in its own process
+        if pending:
+            with ProcessPoolExecutor(max_workers=len(pending)) as executor:
+                futures = {executor.submit(_render_diagram, create_diagram, output_dir):
+                           (label, name, source_hash)
+                           for label, name, create_diagram, source_hash in pending}
+                for future in as_completed(futures):
+                    label, name, source_hash = futures[future]
+                    future.result()
+                    diagram_hash_path(output_dir, name).write_text(source_hash)
+                    print(f"Created {label} diagram")
         
         print("\n" + "="*80)
         print("PERFORMANCE OPTIMIZATION DIAGRAMS GENERATED SUCCESSFULLY")
         print("="*80)
         print(f"Generated diagrams saved to: {output_dir.absolute()}")
         print("\nGenerated Files:")
-        print("- performance_caching_architecture.png/svg")
-        print("- performance_monitoring_optimization.png/svg")
-        print("- async_processing_architecture.png/svg")
+        for _, name, _ in DIAGRAMS:
+            print(f"- {name}." + "/".join(path.suffix[1:] for path in diagram_outputs(output_dir, name)))
         print("\n" + "="*80)
         
     except Exception as e:
@@ -18,20 +18,34 @@ from .optimization import (
     cleanup_memory, get_memory_usage
 )
 
-from .monitoring import (
+# Monitoring names are imported from .monitoring on first access (PEP 562)
+_LAZY_MONITORING = (
     # Monitoring classes
-    LoadTestResult, BenchmarkResult, PerformanceMonitor,
-    LoadTester, BenchmarkSuite, PerformanceReporter,
+    'LoadTestResult', 'BenchmarkResult', 'PerformanceMonitor',
+    'LoadTester', 'BenchmarkSuite', 'PerformanceReporter',
     
     # Global instances
-    get_performance_monitor, get_load_tester, 
-    get_benchmark_suite, get_performance_reporter,
+    'get_performance_monitor', 'get_load_tester',
+    'get_benchmark_suite', 'get_performance_reporter',
     
     # Context managers
-    performance_monitor, benchmark_suite
+    'performance_monitor', 'benchmark_suite'
 )
 
-__all__ = [
+
+def __getattr__(name):
+    if name in _LAZY_MONITORING:
+        from . import monitoring
+        value = getattr(monitoring, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MONITORING))
+
+__all__ = (
     # Core optimization
     'PerformanceMetrics', 'CacheManager', 'DatabaseOptimizer',
     'PerformanceProfiler', 'AsyncTaskManager',
@@ -45,4 +59,4 @@ __all__ = [
     'get_performance_monitor', 'get_load_tester',
     'get_benchmark_suite', 'get_performance_reporter',
     'performance_monitor', 'benchmark_suite'
-]
\ No newline at end of file
+)
\ No newline at end of file
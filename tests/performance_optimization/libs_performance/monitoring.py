@@ -7,44 +7,53 @@ import os
 import sys
 import asyncio
 import time
-import concurrent.futures
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable, Tuple
-from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Callable, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, field
 from pathlib import Path
 import logging
 import json
 import statistics
+import functools
+from timeit import Timer
 import threading
+from collections import deque
+from array import array
+from bisect import bisect_right
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import psutil
-import requests
-import numpy as np
+
+if TYPE_CHECKING:
+    import httpx
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# numpy and httpx are imported where load tests and benchmarks use them, so
+# processes that only run PerformanceMonitor don't pay for them
 try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    from sqlalchemy import create_engine, text
-    from .optimization import (
-        get_cache_manager, get_db_optimizer, get_performance_profiler,
-        PerformanceMetrics
-    )
-    from libs.monitoring import get_metrics_collector
+    from .optimization import get_performance_profiler, PerformanceMetrics
 except ImportError as e:
     logger = logging.getLogger(__name__)
     logger.warning(f"Optional dependencies missing: {e}")
-    plt = None
-    sns = None
+
+try:
+    from tdigest import TDigest
+except ImportError:
+    TDigest = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LoadTestResult:
     """Load test result data structure."""
     test_name: str
@@ -66,11 +75,11 @@ class LoadTestResult:
     timestamp: datetime
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (fields are flat, so no recursive asdict copy)."""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BenchmarkResult:
     """Benchmark result for specific operation."""
     operation_name: str
@@ -85,25 +94,126 @@ class BenchmarkResult:
     timestamp: datetime
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (fields are flat, so no recursive asdict copy)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class LoadTestSamples:
+    """
+    Load test samples with running aggregates.
+    
+    Counts, byte totals and successful response time min/max/sum are kept as
+    running values. Percentiles come from a streaming t-digest when raw
+    samples are not kept, so memory stays bounded however long the test runs;
+    with keep_raw (or when tdigest is not installed) every request is also
+    stored column-wise in compact arrays and percentiles are exact.
+    """
+    keep_raw: bool = False
+    requests: int = 0
+    successes: int = 0
+    total_bytes: int = 0
+    success_time_total: float = 0.0
+    success_time_min: float = float('inf')
+    success_time_max: float = 0.0
+    digest: Any = None
+    response_times: array = field(default_factory=lambda: array('d'))
+    status_codes: array = field(default_factory=lambda: array('i'))
+    response_sizes: array = field(default_factory=lambda: array('q'))
+    success: bytearray = field(default_factory=bytearray)
+    errors: List[str] = field(default_factory=list)
+    
+    def __post_init__(self):
+        if TDigest is None:
+            self.keep_raw = True
+        if not self.keep_raw and self.digest is None:
+            self.digest = TDigest()
+    
+    def __len__(self) -> int:
+        return self.requests
+    
+    def record(self, response_time: float, status_code: int, response_size: int, success: bool):
+        """Fold one request's sample into the aggregates."""
+        self.requests += 1
+        self.total_bytes += response_size
+        if success:
+            self.successes += 1
+            self.success_time_total += response_time
+            if response_time < self.success_time_min:
+                self.success_time_min = response_time
+            if response_time > self.success_time_max:
+                self.success_time_max = response_time
+            if self.digest is not None:
+                self.digest.update(response_time)
+        
+        if self.keep_raw:
+            self.response_times.append(response_time)
+            self.status_codes.append(status_code)
+            self.response_sizes.append(response_size)
+            self.success.append(success)
+    
+    def extend(self, other: 'LoadTestSamples'):
+        """Merge another collection's samples into this one."""
+        self.requests += other.requests
+        self.successes += other.successes
+        self.total_bytes += other.total_bytes
+        self.success_time_total += other.success_time_total
+        self.success_time_min = min(self.success_time_min, other.success_time_min)
+        self.success_time_max = max(self.success_time_max, other.success_time_max)
+        if self.digest is not None and other.digest is not None:
+            self.digest = self.digest + other.digest
+        
+        self.response_times.extend(other.response_times)
+        self.status_codes.extend(other.status_codes)
+        self.response_sizes.extend(other.response_sizes)
+        self.success.extend(other.success)
+        self.errors.extend(other.errors)
+    
+    def percentiles(self, quantiles: List[float]) -> List[float]:
+        """Successful response time percentiles (0-100)."""
+        if self.digest is not None:
+            return [self.digest.percentile(q) for q in quantiles]
+        
+        import numpy as np
+        
+        # Zero-copy NumPy views of the raw columns
+        response_times = np.frombuffer(self.response_times, dtype=np.float64)
+        success = np.frombuffer(self.success, dtype=np.bool_)
+        return np.percentile(response_times[success], quantiles).tolist()
 
 
 class PerformanceMonitor:
-    """Real-time performance monitoring."""
+    """
+    Real-time performance monitoring.
+    
+    The monitor thread is the only writer and only appends to (or pops expired
+    entries from) metrics_history and alerts, so both stay in timestamp order.
+    Readers take a list() snapshot once and answer window queries by bisecting it,
+    which avoids locks and "deque mutated during iteration" errors.
+    """
+    
+    # (threshold key, alert type, PerformanceMetrics field, message template)
+    ALERT_RULES = (
+        ('cpu_usage', 'high_cpu_usage', 'cpu_usage_percent', "High CPU usage: {:.1f}%"),
+        ('memory_usage', 'high_memory_usage', 'memory_usage_percent', "High memory usage: {:.1f}%"),
+        ('response_time', 'slow_response_time', 'average_response_time', "Slow response time: {:.3f}s"),
+    )
     
     def __init__(self, monitoring_interval: float = 1.0):
         self.monitoring_interval = monitoring_interval
         self.is_monitoring = False
         self.monitoring_thread = None
-        self.metrics_history = []
-        self.alerts = []
+        self._stop_event = threading.Event()
+        # Ring buffers: one hour of samples, one day of alerts (evicted oldest-first)
+        self.metrics_history = deque(maxlen=max(1, int(3600 / monitoring_interval)))
+        self.alerts = deque()
         self.alert_thresholds = {
             'cpu_usage': 80.0,
             'memory_usage': 85.0,
             'response_time': 2.0,
             'error_rate': 5.0
         }
+        self._compile_alert_checks()
     
     def start_monitoring(self):
         """Start real-time performance monitoring."""
@@ -112,6 +222,9 @@ class PerformanceMonitor:
             return
         
         self.is_monitoring = True
+        self._stop_event.clear()
+        # Prime the CPU counter so each tick reads usage since the last one without blocking
+        psutil.cpu_percent(interval=None)
         self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self.monitoring_thread.start()
         logger.info("Performance monitoring started")
@@ -119,6 +232,8 @@ class PerformanceMonitor:
     def stop_monitoring(self):
         """Stop performance monitoring."""
         self.is_monitoring = False
+        # Wakes the loop out of its interval wait immediately
+        self._stop_event.set()
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=5)
         logger.info("Performance monitoring stopped")
@@ -130,79 +245,64 @@ class PerformanceMonitor:
         while self.is_monitoring:
             try:
                 # Collect system metrics
-                metrics = profiler.collect_system_metrics()
+                metrics = profiler.collect_system_metrics(cpu_interval=None)
                 self.metrics_history.append(metrics)
                 
-                # Keep only recent metrics (last hour)
-                cutoff_time = datetime.utcnow() - timedelta(hours=1)
-                self.metrics_history = [
-                    m for m in self.metrics_history 
-                    if m.timestamp > cutoff_time
-                ]
+                # Keep only recent metrics (last hour); history is in timestamp order
+                cutoff_time = metrics.timestamp - timedelta(hours=1)
+                while self.metrics_history[0].timestamp <= cutoff_time:
+                    self.metrics_history.popleft()
                 
                 # Check for alerts
                 self._check_alerts(metrics)
                 
-                time.sleep(self.monitoring_interval)
-                
             except Exception as e:
                 logger.error(f"Monitoring error: {e}")
-                time.sleep(self.monitoring_interval)
+            
+            if self._stop_event.wait(self.monitoring_interval):
+                break
     
     def _check_alerts(self, metrics: PerformanceMetrics):
         """Check metrics against alert thresholds."""
         alerts_triggered = []
         
-        # CPU usage alert
-        if metrics.cpu_usage_percent > self.alert_thresholds['cpu_usage']:
-            alerts_triggered.append({
-                'type': 'high_cpu_usage',
-                'value': metrics.cpu_usage_percent,
-                'threshold': self.alert_thresholds['cpu_usage'],
-                'message': f"High CPU usage: {metrics.cpu_usage_percent:.1f}%"
-            })
-        
-        # Memory usage alert
-        if metrics.memory_usage_percent > self.alert_thresholds['memory_usage']:
-            alerts_triggered.append({
-                'type': 'high_memory_usage',
-                'value': metrics.memory_usage_percent,
-                'threshold': self.alert_thresholds['memory_usage'],
-                'message': f"High memory usage: {metrics.memory_usage_percent:.1f}%"
-            })
-        
-        # Response time alert
-        if metrics.average_response_time > self.alert_thresholds['response_time']:
-            alerts_triggered.append({
-                'type': 'slow_response_time',
-                'value': metrics.average_response_time,
-                'threshold': self.alert_thresholds['response_time'],
-                'message': f"Slow response time: {metrics.average_response_time:.3f}s"
-            })
-        
-        # Add alerts with timestamp
+        for alert_type, field_name, threshold, message in self._alert_checks:
+            value = getattr(metrics, field_name)
+            if value > threshold:
+                alerts_triggered.append({
+                    'type': alert_type,
+                    'value': value,
+                    'threshold': threshold,
+                    'message': message.format(value)
+                })
+        
+        # Add alerts with timestamp; 'ts' (epoch seconds) is what retention and queries compare
+        alert_ts = metrics.timestamp.replace(tzinfo=timezone.utc).timestamp()
         for alert in alerts_triggered:
             alert['timestamp'] = metrics.timestamp.isoformat()
+            alert['ts'] = alert_ts
             self.alerts.append(alert)
         
-        # Keep only recent alerts (last 24 hours)
-        cutoff_time = datetime.utcnow() - timedelta(hours=24)
-        self.alerts = [
-            alert for alert in self.alerts
-            if datetime.fromisoformat(alert['timestamp']) > cutoff_time
-        ]
+        # Keep only recent alerts (last 24 hours); alerts are in timestamp order
+        cutoff_ts = alert_ts - 24 * 3600
+        while self.alerts and self.alerts[0]['ts'] <= cutoff_ts:
+            self.alerts.popleft()
     
     def get_current_metrics(self) -> Optional[PerformanceMetrics]:
         """Get most recent performance metrics."""
-        return self.metrics_history[-1] if self.metrics_history else None
+        try:
+            return self.metrics_history[-1]
+        except IndexError:
+            return None
     
     def get_metrics_summary(self, duration_minutes: int = 60) -> Dict[str, Any]:
         """Get performance metrics summary for specified duration."""
         cutoff_time = datetime.utcnow() - timedelta(minutes=duration_minutes)
-        recent_metrics = [
-            m for m in self.metrics_history 
-            if m.timestamp > cutoff_time
-        ]
+        cutoff_ts = time.time() - duration_minutes * 60
+        history = list(self.metrics_history)
+        alerts = list(self.alerts)
+        
+        recent_metrics = history[bisect_right(history, cutoff_time, key=lambda m: m.timestamp):]
         
         if not recent_metrics:
             return {'message': 'No metrics available for specified duration'}
@@ -233,20 +333,26 @@ class PerformanceMonitor:
                 'max': max(response_times),
                 'std_dev': statistics.stdev(response_times) if len(response_times) > 1 else 0
             },
-            'alerts_count': len([a for a in self.alerts if datetime.fromisoformat(a['timestamp']) > cutoff_time])
+            'alerts_count': len(alerts) - bisect_right(alerts, cutoff_ts, key=lambda a: a['ts'])
         }
     
     def get_recent_alerts(self, duration_hours: int = 24) -> List[Dict[str, Any]]:
         """Get recent alerts."""
-        cutoff_time = datetime.utcnow() - timedelta(hours=duration_hours)
-        return [
-            alert for alert in self.alerts
-            if datetime.fromisoformat(alert['timestamp']) > cutoff_time
-        ]
+        cutoff_ts = time.time() - duration_hours * 3600
+        alerts = list(self.alerts)
+        return alerts[bisect_right(alerts, cutoff_ts, key=lambda a: a['ts']):]
+    
+    def _compile_alert_checks(self):
+        """Resolve ALERT_RULES against the current thresholds once, off the per-tick path."""
+        self._alert_checks = tuple(
+            (alert_type, field_name, float(self.alert_thresholds[key]), message)
+            for key, alert_type, field_name, message in self.ALERT_RULES
+        )
     
     def set_alert_thresholds(self, thresholds: Dict[str, float]):
         """Update alert thresholds."""
         self.alert_thresholds.update(thresholds)
+        self._compile_alert_checks()
         logger.info(f"Alert thresholds updated: {self.alert_thresholds}")
 
 
@@ -255,8 +361,7 @@ class LoadTester:
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': 'Performance-LoadTester/1.0'})
+        self.default_headers = {'User-Agent': 'Performance-LoadTester/1.0'}
     
     def run_load_test(self, 
                      endpoint: str,
@@ -265,45 +370,58 @@ class LoadTester:
                      ramp_up_seconds: int = 10,
                      method: str = 'GET',
                      payload: Dict[str, Any] = None,
-                     headers: Dict[str, str] = None) -> LoadTestResult:
-        """Run load test against specified endpoint."""
+                     headers: Dict[str, str] = None,
+                     think_time: float = 0.0,
+                     keep_raw: bool = False) -> LoadTestResult:
+        """
+        Run load test against specified endpoint.
+        
+        Each virtual user issues requests back to back; set think_time (seconds)
+        to pause between a user's requests and model a realistic request rate.
+        Response time percentiles are estimated with a streaming t-digest; pass
+        keep_raw=True to keep every sample and compute them exactly.
+        
+        This starts its own event loop with asyncio.run(), so it raises
+        RuntimeError when called from a running loop (async handlers, Jupyter,
+        async tests); await arun_load_test() there instead.
+        """
+        return asyncio.run(self.arun_load_test(
+            endpoint, concurrent_users, duration_seconds, ramp_up_seconds, method, payload, headers,
+            think_time, keep_raw
+        ))
+    
+    async def arun_load_test(self, 
+                             endpoint: str,
+                             concurrent_users: int = 10,
+                             duration_seconds: int = 60,
+                             ramp_up_seconds: int = 10,
+                             method: str = 'GET',
+                             payload: Dict[str, Any] = None,
+                             headers: Dict[str, str] = None,
+                             think_time: float = 0.0,
+                             keep_raw: bool = False) -> LoadTestResult:
+        """Run load test against specified endpoint on the caller's event loop (see run_load_test)."""
         
         logger.info(f"Starting load test: {concurrent_users} users, {duration_seconds}s duration")
         
         url = f"{self.base_url}{endpoint}"
-        results = []
         start_time = time.time()
         
-        # Track system metrics during test
-        initial_cpu = psutil.cpu_percent()
+        # Track system metrics during test; priming makes the final CPU reading
+        # cover the whole test rather than an instantaneous snapshot
+        psutil.cpu_percent(interval=None)
         initial_memory = psutil.virtual_memory().percent
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_users) as executor:
-            # Submit all requests
-            futures = []
-            
-            for i in range(concurrent_users):
-                # Stagger request starts for ramp-up
-                delay = (i / concurrent_users) * ramp_up_seconds
-                future = executor.submit(
-                    self._run_user_requests,
-                    url, duration_seconds, delay, method, payload, headers
-                )
-                futures.append(future)
-            
-            # Collect results
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    user_results = future.result()
-                    results.extend(user_results)
-                except Exception as e:
-                    logger.error(f"User request failed: {e}")
+        results = await self._run_virtual_users(
+            url, concurrent_users, duration_seconds, ramp_up_seconds, method, payload, headers,
+            think_time, keep_raw
+        )
         
         end_time = time.time()
         actual_duration = end_time - start_time
         
         # Calculate final system metrics
-        final_cpu = psutil.cpu_percent()
+        test_cpu = psutil.cpu_percent(interval=None)
         final_memory = psutil.virtual_memory().percent
         
         # Analyze results
@@ -311,69 +429,101 @@ class LoadTester:
             f"Load test {endpoint}",
             results,
             actual_duration,
-            (initial_cpu + final_cpu) / 2,
+            test_cpu,
             (initial_memory + final_memory) / 2
         )
     
-    def _run_user_requests(self, 
-                          url: str, 
-                          duration_seconds: int, 
-                          delay: float,
-                          method: str,
-                          payload: Dict[str, Any],
-                          headers: Dict[str, str]) -> List[Dict[str, Any]]:
+    async def _run_virtual_users(self,
+                                 url: str,
+                                 concurrent_users: int,
+                                 duration_seconds: int,
+                                 ramp_up_seconds: int,
+                                 method: str,
+                                 payload: Dict[str, Any],
+                                 headers: Dict[str, str],
+                                 think_time: float,
+                                 keep_raw: bool) -> LoadTestSamples:
+        """Run all virtual users on one event loop sharing a pooled client."""
+        import httpx
+        
+        limits = httpx.Limits(max_connections=concurrent_users,
+                              max_keepalive_connections=concurrent_users)
+        
+        async with httpx.AsyncClient(headers=self.default_headers, limits=limits, timeout=30) as client:
+            user_outcomes = await asyncio.gather(*(
+                # Stagger request starts for ramp-up
+                self._run_user_requests(
+                    client, url, duration_seconds,
+                    (i / concurrent_users) * ramp_up_seconds, method, payload, headers,
+                    think_time, keep_raw
+                )
+                for i in range(concurrent_users)
+            ), return_exceptions=True)
+        
+        # Collect results
+        results = LoadTestSamples(keep_raw=keep_raw)
+        for outcome in user_outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"User request failed: {outcome}")
+            else:
+                results.extend(outcome)
+        
+        if results.errors:
+            logger.warning(f"{len(results.errors)} requests raised errors, first: {results.errors[0]}")
+        return results
+    
+    async def _run_user_requests(self, 
+                                client: 'httpx.AsyncClient',
+                                url: str, 
+                                duration_seconds: int, 
+                                delay: float,
+                                method: str,
+                                payload: Dict[str, Any],
+                                headers: Dict[str, str],
+                                think_time: float = 0.0,
+                                keep_raw: bool = False) -> LoadTestSamples:
         """Run requests for a single virtual user."""
         if delay > 0:
-            time.sleep(delay)
+            await asyncio.sleep(delay)
         
-        results = []
+        method = method.upper()
+        results = LoadTestSamples(keep_raw=keep_raw)
         start_time = time.time()
         
         while time.time() - start_time < duration_seconds:
             request_start = time.time()
             
             try:
-                if method.upper() == 'GET':
-                    response = self.session.get(url, headers=headers, timeout=30)
-                elif method.upper() == 'POST':
-                    response = self.session.post(url, json=payload, headers=headers, timeout=30)
-                elif method.upper() == 'PUT':
-                    response = self.session.put(url, json=payload, headers=headers, timeout=30)
-                else:
+                if method not in ('GET', 'POST', 'PUT'):
                     raise ValueError(f"Unsupported HTTP method: {method}")
                 
+                response = await client.request(
+                    method, url, headers=headers,
+                    json=payload if method != 'GET' else None
+                )
+                
                 request_end = time.time()
                 response_time = request_end - request_start
                 
-                results.append({
-                    'timestamp': request_start,
-                    'response_time': response_time,
-                    'status_code': response.status_code,
-                    'success': 200 <= response.status_code < 400,
-                    'response_size': len(response.content)
-                })
+                results.record(response_time, response.status_code, len(response.content),
+                               200 <= response.status_code < 400)
                 
             except Exception as e:
                 request_end = time.time()
                 response_time = request_end - request_start
                 
-                results.append({
-                    'timestamp': request_start,
-                    'response_time': response_time,
-                    'status_code': 0,
-                    'success': False,
-                    'error': str(e),
-                    'response_size': 0
-                })
+                results.record(response_time, 0, 0, False)
+                results.errors.append(str(e))
             
-            # Small delay between requests to simulate realistic usage
-            time.sleep(0.1)
+            # Optional pause between requests to simulate realistic usage
+            if think_time:
+                await asyncio.sleep(think_time)
         
         return results
     
     def _analyze_load_test_results(self, 
                                   test_name: str,
-                                  results: List[Dict[str, Any]],
+                                  results: LoadTestSamples,
                                   duration: float,
                                   avg_cpu: float,
                                   avg_memory: float) -> LoadTestResult:
@@ -400,41 +550,35 @@ class LoadTester:
                 timestamp=datetime.utcnow()
             )
         
-        # Calculate statistics
-        successful_results = [r for r in results if r['success']]
-        failed_results = [r for r in results if not r['success']]
-        
-        response_times = [r['response_time'] for r in results]
-        successful_response_times = [r['response_time'] for r in successful_results]
+        count = results.requests
+        successful_count = results.successes
+        failed_count = count - successful_count
         
-        total_data_bytes = sum(r['response_size'] for r in results)
-        throughput_mb_per_sec = (total_data_bytes / 1024 / 1024) / duration
+        throughput_mb_per_sec = (results.total_bytes / 1024 / 1024) / duration
         
         # Calculate percentiles
-        if successful_response_times:
-            p50 = np.percentile(successful_response_times, 50)
-            p95 = np.percentile(successful_response_times, 95)
-            p99 = np.percentile(successful_response_times, 99)
-            avg_response_time = statistics.mean(successful_response_times)
-            min_response_time = min(successful_response_times)
-            max_response_time = max(successful_response_times)
+        if successful_count:
+            p50, p95, p99 = results.percentiles([50, 95, 99])
+            avg_response_time = results.success_time_total / successful_count
+            min_response_time = results.success_time_min
+            max_response_time = results.success_time_max
         else:
             p50 = p95 = p99 = avg_response_time = min_response_time = max_response_time = 0.0
         
         return LoadTestResult(
             test_name=test_name,
             duration_seconds=duration,
-            total_requests=len(results),
-            successful_requests=len(successful_results),
-            failed_requests=len(failed_results),
+            total_requests=count,
+            successful_requests=successful_count,
+            failed_requests=failed_count,
             average_response_time=avg_response_time,
             min_response_time=min_response_time,
             max_response_time=max_response_time,
-            p50_response_time=p50,
-            p95_response_time=p95,
-            p99_response_time=p99,
-            requests_per_second=len(results) / duration,
-            error_rate=(len(failed_results) / len(results)) * 100,
+            p50_response_time=float(p50),
+            p95_response_time=float(p95),
+            p99_response_time=float(p99),
+            requests_per_second=count / duration,
+            error_rate=(failed_count / count) * 100,
             throughput_mb_per_sec=throughput_mb_per_sec,
             cpu_usage_percent=avg_cpu,
             memory_usage_percent=avg_memory,
@@ -445,8 +589,14 @@ class LoadTester:
                        endpoint: str,
                        max_users: int = 100,
                        step_size: int = 10,
-                       step_duration: int = 30) -> List[LoadTestResult]:
-        """Run stress test with increasing load."""
+                       step_duration: int = 30,
+                       step_gap: float = 0.0) -> List[LoadTestResult]:
+        """
+        Run stress test with increasing load.
+        
+        Steps run back to back; set step_gap (seconds) to let the target settle
+        between steps.
+        """
         
         logger.info(f"Starting stress test: 0 to {max_users} users")
         results = []
@@ -458,13 +608,15 @@ class LoadTester:
                 endpoint=endpoint,
                 concurrent_users=users,
                 duration_seconds=step_duration,
-                ramp_up_seconds=5
+                ramp_up_seconds=5,
+                think_time=0
             )
             
             results.append(result)
             
-            # Brief pause between test steps
-            time.sleep(5)
+            # Optional pause between test steps
+            if step_gap > 0:
+                time.sleep(step_gap)
         
         return results
 
@@ -472,8 +624,12 @@ class LoadTester:
 class BenchmarkSuite:
     """Performance benchmarking suite."""
     
+    # Fewest timed batches per benchmark, so min/max/std describe real spread
+    MIN_BATCHES = 5
+    
     def __init__(self):
         self.benchmark_results = []
+        self._process = psutil.Process()
     
     def benchmark_function(self, 
                           func: Callable,
@@ -481,53 +637,61 @@ class BenchmarkSuite:
                           iterations: int = 1000,
                           warmup_iterations: int = 100,
                           *args, **kwargs) -> BenchmarkResult:
-        """Benchmark a function's performance."""
+        """
+        Benchmark a function's performance.
+        
+        Roughly `iterations` calls are timed in at least MIN_BATCHES batches (fewer
+        only when iterations is smaller), so per-call min/max/std come from several
+        batch timings; timeit's autorange caps a batch at about 0.2s. A
+        single probe call runs before warmup; if it, a warmup call or a timed
+        call raises, the benchmark fails and returns None.
+        """
         
         func_name = func_name or func.__name__
         logger.info(f"Benchmarking {func_name} with {iterations} iterations")
         
-        # Warmup
-        for _ in range(warmup_iterations):
-            try:
+        # Probe once, then warm up; a broken target fails fast instead of being
+        # hidden by warmup, and the loop itself carries no per-call handler
+        try:
+            func(*args, **kwargs)
+            for _ in range(warmup_iterations):
                 func(*args, **kwargs)
-            except Exception:
-                pass  # Ignore errors during warmup
+        except Exception as e:
+            logger.error(f"Benchmark warmup failed for {func_name}: {e}")
+            return None
         
-        # Actual benchmark
-        times = []
-        start_memory = psutil.Process().memory_info().rss
+        import numpy as np
         
-        for _ in range(iterations):
-            start_time = time.perf_counter()
-            try:
-                func(*args, **kwargs)
-                end_time = time.perf_counter()
-                times.append(end_time - start_time)
-            except Exception as e:
-                logger.warning(f"Benchmark iteration failed: {e}")
-                times.append(float('inf'))  # Record failed attempt
+        # Actual benchmark
+        timer = Timer(functools.partial(func, *args, **kwargs))
+        start_memory = self._process.memory_info().rss
+        
+        try:
+            target_batches = min(iterations, self.MIN_BATCHES)
+            autorange_number, _ = timer.autorange()
+            number = min(max(1, iterations // target_batches), autorange_number)
+            batches = max(target_batches, iterations // number)
+            batch_times = np.array(timer.repeat(repeat=batches, number=number))
+        except Exception as e:
+            logger.error(f"Benchmark failed for {func_name}: {e}")
+            return None
         
-        end_memory = psutil.Process().memory_info().rss
+        end_memory = self._process.memory_info().rss
         memory_usage_mb = (end_memory - start_memory) / 1024 / 1024
         
-        # Filter out failed attempts for statistics
-        valid_times = [t for t in times if t != float('inf')]
-        
-        if not valid_times:
-            logger.error(f"All benchmark iterations failed for {func_name}")
-            return None
-        
-        # Calculate statistics
-        total_time = sum(valid_times)
-        average_time = statistics.mean(valid_times)
-        min_time = min(valid_times)
-        max_time = max(valid_times)
-        std_deviation = statistics.stdev(valid_times) if len(valid_times) > 1 else 0.0
-        ops_per_second = len(valid_times) / total_time if total_time > 0 else 0
+        # Calculate statistics from per-call times of each batch
+        call_times = batch_times / number
+        calls = batches * number
+        total_time = float(batch_times.sum())
+        average_time = total_time / calls
+        min_time = float(call_times.min())
+        max_time = float(call_times.max())
+        std_deviation = float(call_times.std(ddof=1)) if batches > 1 else 0.0
+        ops_per_second = calls / total_time if total_time > 0 else 0
         
         result = BenchmarkResult(
             operation_name=func_name,
-            iterations=len(valid_times),
+            iterations=calls,
             total_time=total_time,
             average_time=average_time,
             min_time=min_time,
@@ -552,48 +716,55 @@ class BenchmarkSuite:
         func_name = func_name or func.__name__
         logger.info(f"Benchmarking async {func_name} with {iterations} iterations")
         
-        # Warmup
-        for _ in range(warmup_iterations):
-            try:
+        # Probe once, then warm up; a broken target fails fast instead of being
+        # hidden by warmup, and the loop itself carries no per-call handler
+        try:
+            await func(*args, **kwargs)
+            for _ in range(warmup_iterations):
                 await func(*args, **kwargs)
-            except Exception:
-                pass
+        except Exception as e:
+            logger.error(f"Benchmark warmup failed for {func_name}: {e}")
+            return None
         
-        # Actual benchmark
-        times = []
-        start_memory = psutil.Process().memory_info().rss
+        import numpy as np
+        
+        # Actual benchmark; failed iterations are masked out rather than recorded as inf.
+        # Integer nanosecond deltas keep full clock resolution until reporting.
+        times_ns = np.empty(iterations, dtype=np.int64)
+        ok = np.zeros(iterations, dtype=np.bool_)
+        clock = time.perf_counter_ns
+        start_memory = self._process.memory_info().rss
         
-        for _ in range(iterations):
-            start_time = time.perf_counter()
+        for i in range(iterations):
+            start_time = clock()
             try:
                 await func(*args, **kwargs)
-                end_time = time.perf_counter()
-                times.append(end_time - start_time)
+                times_ns[i] = clock() - start_time
+                ok[i] = True
             except Exception as e:
                 logger.warning(f"Async benchmark iteration failed: {e}")
-                times.append(float('inf'))
         
-        end_memory = psutil.Process().memory_info().rss
+        end_memory = self._process.memory_info().rss
         memory_usage_mb = (end_memory - start_memory) / 1024 / 1024
         
-        # Filter out failed attempts
-        valid_times = [t for t in times if t != float('inf')]
+        # Filter out failed attempts and convert to seconds
+        valid_times = times_ns[ok] / 1e9
         
-        if not valid_times:
+        if not valid_times.size:
             logger.error(f"All async benchmark iterations failed for {func_name}")
             return None
         
         # Calculate statistics
-        total_time = sum(valid_times)
-        average_time = statistics.mean(valid_times)
-        min_time = min(valid_times)
-        max_time = max(valid_times)
-        std_deviation = statistics.stdev(valid_times) if len(valid_times) > 1 else 0.0
-        ops_per_second = len(valid_times) / total_time if total_time > 0 else 0
+        total_time = float(valid_times.sum())
+        average_time = float(valid_times.mean())
+        min_time = float(valid_times.min())
+        max_time = float(valid_times.max())
+        std_deviation = float(valid_times.std(ddof=1)) if valid_times.size > 1 else 0.0
+        ops_per_second = valid_times.size / total_time if total_time > 0 else 0
         
         result = BenchmarkResult(
             operation_name=f"async_{func_name}",
-            iterations=len(valid_times),
+            iterations=int(valid_times.size),
             total_time=total_time,
             average_time=average_time,
             min_time=min_time,
@@ -607,13 +778,92 @@ class BenchmarkSuite:
         self.benchmark_results.append(result)
         return result
     
-    def benchmark_database_operations(self, db_optimizer) -> List[BenchmarkResult]:
+    def benchmark_concurrent(self,
+                             func: Callable,
+                             func_name: str = None,
+                             iterations: int = 1000,
+                             concurrency: int = 4,
+                             warmup_iterations: int = 10) -> Optional[BenchmarkResult]:
+        """
+        Benchmark a function under concurrent load.
+        
+        `iterations` calls are split across `concurrency` worker threads, each
+        timing its calls into its own slice of a shared nanosecond buffer. Total
+        time is the wall-clock of the whole run, so operations_per_second is the
+        concurrent throughput rather than single-thread latency.
+        """
+        import numpy as np
+        
+        func_name = func_name or func.__name__
+        logger.info(f"Benchmarking {func_name} with {iterations} iterations across {concurrency} workers")
+        
+        # Probe once, then warm up; a broken target fails fast instead of being
+        # hidden by warmup, and the loop itself carries no per-call handler
+        try:
+            func()
+            for _ in range(warmup_iterations):
+                func()
+        except Exception as e:
+            logger.error(f"Benchmark warmup failed for {func_name}: {e}")
+            return None
+        
+        times_ns = np.empty(iterations, dtype=np.int64)
+        bounds = [iterations * worker // concurrency for worker in range(concurrency + 1)]
+        
+        def run_slice(start: int, stop: int):
+            clock = time.perf_counter_ns
+            for i in range(start, stop):
+                call_start = clock()
+                func()
+                times_ns[i] = clock() - call_start
+        
+        start_memory = self._process.memory_info().rss
+        wall_start = time.perf_counter_ns()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(run_slice, bounds[w], bounds[w + 1]) for w in range(concurrency)]
+                for future in futures:
+                    future.result()
+        except Exception as e:
+            logger.error(f"Benchmark failed for {func_name}: {e}")
+            return None
+        
+        total_time = (time.perf_counter_ns() - wall_start) / 1e9
+        end_memory = self._process.memory_info().rss
+        
+        call_times = times_ns / 1e9
+        result = BenchmarkResult(
+            operation_name=func_name,
+            iterations=iterations,
+            total_time=total_time,
+            average_time=float(call_times.mean()),
+            min_time=float(call_times.min()),
+            max_time=float(call_times.max()),
+            std_deviation=float(call_times.std(ddof=1)) if iterations > 1 else 0.0,
+            operations_per_second=iterations / total_time if total_time > 0 else 0,
+            memory_usage_mb=(end_memory - start_memory) / 1024 / 1024,
+            timestamp=datetime.utcnow()
+        )
+        
+        self.benchmark_results.append(result)
+        return result
+    
+    def _benchmark_runner(self, concurrency: int) -> Callable[..., Optional[BenchmarkResult]]:
+        """Sequential benchmark_function, or benchmark_concurrent when concurrency > 1."""
+        if concurrency > 1:
+            return functools.partial(self.benchmark_concurrent, concurrency=concurrency)
+        return self.benchmark_function
+    
+    def benchmark_database_operations(self, db_optimizer, concurrency: int = 1) -> List[BenchmarkResult]:
         """Benchmark common database operations."""
         results = []
+        run = self._benchmark_runner(concurrency)
         
         # Benchmark simple SELECT
-        result = self.benchmark_function(
-            lambda: db_optimizer.execute_query("SELECT 1 as test_column"),
+        select_sql = "SELECT 1 as test_column"
+        result = run(
+            lambda: db_optimizer.execute_query(select_sql),
             "simple_select",
             iterations=100
         )
@@ -621,11 +871,10 @@ class BenchmarkSuite:
             results.append(result)
         
         # Benchmark parameterized query
-        result = self.benchmark_function(
-            lambda: db_optimizer.execute_query(
-                "SELECT * FROM information_schema.tables WHERE table_name = :name",
-                {"name": "test_table"}
-            ),
+        parameterized_sql = "SELECT * FROM information_schema.tables WHERE table_name = :name"
+        params = {"name": "test_table"}
+        result = run(
+            lambda: db_optimizer.execute_query(parameterized_sql, params),
             "parameterized_query",
             iterations=100
         )
@@ -634,13 +883,15 @@ class BenchmarkSuite:
         
         return results
     
-    def benchmark_cache_operations(self, cache_manager) -> List[BenchmarkResult]:
+    def benchmark_cache_operations(self, cache_manager, concurrency: int = 1) -> List[BenchmarkResult]:
         """Benchmark cache operations."""
         results = []
+        run = self._benchmark_runner(concurrency)
         
-        # Benchmark cache set
-        result = self.benchmark_function(
-            lambda: cache_manager.set("test_key", {"data": "test_value"}),
+        # Benchmark cache set; key and value are built once so only cache I/O is timed
+        set_value = {"data": "test_value"}
+        result = run(
+            lambda: cache_manager.set("test_key", set_value),
             "cache_set",
             iterations=1000
         )
@@ -649,7 +900,7 @@ class BenchmarkSuite:
         
         # Benchmark cache get
         cache_manager.set("benchmark_key", {"data": "benchmark_value"})
-        result = self.benchmark_function(
+        result = run(
             lambda: cache_manager.get("benchmark_key"),
             "cache_get",
             iterations=1000
@@ -755,8 +1006,15 @@ class PerformanceReporter:
         filepath = PROJECT_ROOT / "reports" / filename
         filepath.parent.mkdir(exist_ok=True)
         
-        with open(filepath, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        if orjson is not None:
+            # datetimes and NumPy values are serialized natively; default=str covers the rest
+            filepath.write_bytes(orjson.dumps(
+                report, default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(report, f, indent=2, default=str)
         
         logger.info(f"Performance report saved to {filepath}")
         return filepath
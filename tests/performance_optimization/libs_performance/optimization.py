@@ -540,6 +540,7 @@ class PerformanceProfiler:
         self.system_metrics = []
         self.profiling_enabled = True
         self.max_stored_metrics = 1000
+        self._process = psutil.Process()
     
     def profile_function(self, func_name: str = None):
         """Decorator for profiling function performance."""
@@ -638,16 +639,21 @@ class PerformanceProfiler:
         if len(self.request_times) > self.max_stored_metrics:
             self.request_times = self.request_times[-self.max_stored_metrics:]
     
-    def collect_system_metrics(self) -> PerformanceMetrics:
-        """Collect current system performance metrics."""
+    def collect_system_metrics(self, cpu_interval: Optional[float] = 1) -> PerformanceMetrics:
+        """
+        Collect current system performance metrics.
+        
+        cpu_interval=None reports CPU usage since the previous call without blocking;
+        the caller is expected to have primed psutil.cpu_percent beforehand.
+        """
         try:
             # CPU and memory usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=cpu_interval)
             memory = psutil.virtual_memory()
             memory_percent = memory.percent
             
             # Process information
-            process = psutil.Process()
+            process = self._process
             process_memory = process.memory_info().rss / 1024 / 1024  # MB
             thread_count = process.num_threads()
             
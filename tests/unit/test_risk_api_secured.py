@@ -0,0 +1,140 @@
+"""
+Unit Tests for the Secured Risk API
+Tests for conditional GET on the portfolio list
+"""
+
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest.mock import Mock, patch
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from starlette.requests import Request
+
+from tests.test_framework import TestBase
+from libs.storage import RedisClient, CacheManager
+
+
+def _stub_module(name: str, **attrs) -> ModuleType:
+    """Build a stand-in module exposing only the given attributes."""
+    module = ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+async def _current_user():
+    """Stands in for token verification; the tests call endpoints directly."""
+    return None
+
+
+# The service imports config, security, data and risk modules at import time and
+# builds its app from them; the ETag path needs none of them, so stub them all
+_SERVICE_DEPENDENCY_STUBS = {
+    'config': _stub_module('config', get_config=lambda: {}),
+    'libs.monitoring': _stub_module('libs.monitoring', get_metrics_collector=lambda: None),
+    'libs.security.security_framework': _stub_module(
+        'libs.security.security_framework', User=SimpleNamespace, Role=Mock(), Permission=Mock()
+    ),
+    'libs.security.middleware': _stub_module(
+        'libs.security.middleware',
+        configure_security=lambda app, config=None: Mock(),
+        get_current_user=_current_user,
+        require_permission=lambda permission: _current_user,
+        require_role=lambda role: _current_user,
+    ),
+    'libs.security.authentication': _stub_module('libs.security.authentication', get_auth_service=Mock),
+    'libs.data.snowflake_client': _stub_module('libs.data.snowflake_client', get_snowflake_client=lambda: None),
+    'libs.data.market_data_client': _stub_module(
+        'libs.data.market_data_client', get_market_data_provider=lambda: None
+    ),
+    'libs.risk.calculations': _stub_module('libs.risk.calculations', get_risk_calculator=lambda: None),
+    'libs.storage': _stub_module('libs.storage', get_cache_manager=lambda: None),
+}
+
+
+class _FakeRedis:
+    """Stands in for redis.Redis with decode_responses=True: values come back as str."""
+    
+    def __init__(self):
+        self.data = {}
+    
+    def set(self, key, value, ex=None):
+        self.data[key] = str(value)
+        return True
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+
+class TestPortfoliosETag(TestBase):
+    """Test the portfolio list ETag with a Redis-backed cache."""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with patch.dict(sys.modules, _SERVICE_DEPENDENCY_STUBS):
+            sys.modules.pop('services.risk_api_secured', None)
+            import services.risk_api_secured as api
+        cls.api = api
+        cls.user = SimpleNamespace(user_id='test_001')
+    
+    def setUp(self):
+        super().setUp()
+        redis_client = RedisClient.__new__(RedisClient)
+        redis_client.client = _FakeRedis()
+        self.cache_manager = CacheManager(redis_client=redis_client)
+        self.assertTrue(self.cache_manager.use_redis)
+        
+        self.snowflake = Mock()
+        self.snowflake.get_user_portfolios.return_value = [{'portfolio_id': 'PORTFOLIO_1'}]
+        
+        for patcher in (
+            patch.object(self.api, 'cache_manager', self.cache_manager),
+            patch.object(self.api, 'metrics_collector', None),
+            patch.object(self.api.app.state, 'snowflake', self.snowflake, create=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def _get_portfolios(self, if_none_match: str = None):
+        headers = [(b'if-none-match', if_none_match.encode())] if if_none_match else []
+        request = Request({'type': 'http', 'method': 'GET', 'path': '/portfolios', 'headers': headers})
+        return asyncio.run(self.api.get_portfolios(request, self.user))
+    
+    def test_cached_etag_short_circuits_database(self):
+        """Test a matching If-None-Match is answered from the Redis-cached ETag."""
+        first = self._get_portfolios()
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers['etag']
+        
+        second = self._get_portfolios(if_none_match=etag)
+        
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers['etag'], etag)
+        self.snowflake.get_user_portfolios.assert_called_once()
+    
+    def test_invalidated_etag_refetches_portfolios(self):
+        """Test a portfolio write invalidation makes the next request hit the database."""
+        etag = self._get_portfolios().headers['etag']
+        self.snowflake.get_user_portfolios.return_value = [
+            {'portfolio_id': 'PORTFOLIO_1'}, {'portfolio_id': 'PORTFOLIO_2'}
+        ]
+        
+        self.api.invalidate_portfolios_etag(self.user.user_id)
+        response = self._get_portfolios(if_none_match=etag)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['etag'], etag)
+        self.assertEqual(self.snowflake.get_user_portfolios.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,16 +17,31 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from tests.test_framework import TestBase, TestFixtures
 from libs.risk.calculations import RiskCalculationEngine, RiskResults
 
+# Constant daily return series, i.e. zero volatility
+_ZERO_RETURNS = pd.Series(np.full(10, 0.001))
+
 
 class TestRiskCalculationEngine(TestBase):
     """Test cases for the Risk Calculation Engine."""
     
-    def setUp(self):
-        super().setUp()
-        self.risk_engine = RiskCalculationEngine()
-        self.sample_returns = pd.Series([0.01, -0.02, 0.005, -0.015, 0.025, 0.008, -0.012])
-        self.sample_positions = self.fixtures.get_sample_portfolio_positions()
-        self.sample_prices = self.fixtures.get_sample_price_data()
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The engine holds no per-call state, so one instance serves every test
+        cls.risk_engine = RiskCalculationEngine()
+        
+        # Read-only inputs shared by every test in the class
+        cls.sample_returns = pd.Series([0.01, -0.02, 0.005, -0.015, 0.025, 0.008, -0.012])
+        cls.returns_with_drawdown = pd.Series([0.1, -0.05, -0.1, -0.05, 0.15, 0.05])
+        cls.portfolio_returns = pd.Series([0.01, -0.02, 0.015, -0.01, 0.02])
+        cls.market_returns = pd.Series([0.008, -0.015, 0.012, -0.008, 0.018])
+        cls.sample_positions = cls.fixtures.get_sample_portfolio_positions()
+        cls.sample_prices = cls.fixtures.get_sample_price_data()
+        
+        # Tail metrics of sample_returns, reused by the tests that compare them
+        cls._var_95 = cls.risk_engine.calculate_var(cls.sample_returns, 0.95)
+        cls._var_99 = cls.risk_engine.calculate_var(cls.sample_returns, 0.99)
+        cls._es_95 = cls.risk_engine.calculate_expected_shortfall(cls.sample_returns, 0.95)
     
     def test_calculate_returns_simple(self):
         """Test simple return calculation."""
@@ -34,7 +49,8 @@ class TestRiskCalculationEngine(TestBase):
         returns = self.risk_engine.calculate_returns(prices, method='simple')
         
         expected_returns = prices.pct_change().dropna()
-        pd.testing.assert_series_equal(returns, expected_returns)
+        self.assertTrue(returns.index.equals(expected_returns.index))
+        np.testing.assert_allclose(returns.to_numpy(), expected_returns.to_numpy(), rtol=1e-12)
     
     def test_calculate_returns_log(self):
         """Test logarithmic return calculation."""
@@ -42,7 +58,8 @@ class TestRiskCalculationEngine(TestBase):
         returns = self.risk_engine.calculate_returns(prices, method='log')
         
         expected_returns = np.log(prices / prices.shift(1)).dropna()
-        pd.testing.assert_series_equal(returns, expected_returns)
+        self.assertTrue(returns.index.equals(expected_returns.index))
+        np.testing.assert_allclose(returns.to_numpy(), expected_returns.to_numpy(), rtol=1e-12)
     
     def test_calculate_returns_empty_series(self):
         """Test return calculation with empty series."""
@@ -54,7 +71,7 @@ class TestRiskCalculationEngine(TestBase):
     
     def test_calculate_var_95(self):
         """Test VaR calculation at 95% confidence level."""
-        var_95 = self.risk_engine.calculate_var(self.sample_returns, 0.95)
+        var_95 = self._var_95
         
         # VaR should be positive and reasonable
         self.assertGreater(var_95, 0)
@@ -62,28 +79,34 @@ class TestRiskCalculationEngine(TestBase):
         
         # Check that it's approximately the 5th percentile
         expected_var = abs(np.percentile(self.sample_returns, 5))
-        self.assertAlmostEqual(var_95, expected_var, places=4)
+        assert var_95 == pytest.approx(expected_var, abs=5e-5)
     
     def test_calculate_var_99(self):
         """Test VaR calculation at 99% confidence level."""
-        var_99 = self.risk_engine.calculate_var(self.sample_returns, 0.99)
+        var_99 = self._var_99
         
         self.assertGreater(var_99, 0)
         self.assertLess(var_99, 1)
         
         # 99% VaR should be higher than 95% VaR
-        var_95 = self.risk_engine.calculate_var(self.sample_returns, 0.95)
-        self.assertGreaterEqual(var_99, var_95)
+        self.assertGreaterEqual(var_99, self._var_95)
+    
+    def test_calculate_var_levels(self):
+        """Test multi-level VaR matches single-level VaR at each confidence level."""
+        var_levels = self.risk_engine.calculate_var_levels(self.sample_returns, (0.95, 0.99))
+        
+        self.assertEqual(set(var_levels), {0.95, 0.99})
+        assert var_levels[0.95] == pytest.approx(self._var_95, abs=5e-8)
+        assert var_levels[0.99] == pytest.approx(self._var_99, abs=5e-8)
     
     def test_calculate_expected_shortfall(self):
         """Test Expected Shortfall calculation."""
-        es = self.risk_engine.calculate_expected_shortfall(self.sample_returns, 0.95)
+        es = self._es_95
         
         self.assertGreater(es, 0)
         
         # Expected Shortfall should be higher than VaR
-        var_95 = self.risk_engine.calculate_var(self.sample_returns, 0.95)
-        self.assertGreaterEqual(es, var_95)
+        self.assertGreaterEqual(es, self._var_95)
     
     def test_calculate_volatility_annualized(self):
         """Test annualized volatility calculation."""
@@ -93,7 +116,7 @@ class TestRiskCalculationEngine(TestBase):
         
         # Check calculation
         expected_vol = self.sample_returns.std() * np.sqrt(252)
-        self.assertAlmostEqual(vol, expected_vol, places=6)
+        assert vol == pytest.approx(expected_vol, abs=5e-7)
     
     def test_calculate_volatility_daily(self):
         """Test daily volatility calculation."""
@@ -101,7 +124,7 @@ class TestRiskCalculationEngine(TestBase):
         vol_annual = self.risk_engine.calculate_volatility(self.sample_returns, annualize=True)
         
         # Annual volatility should be higher (by sqrt(252))
-        self.assertAlmostEqual(vol_annual, vol_daily * np.sqrt(252), places=6)
+        assert vol_annual == pytest.approx(vol_daily * np.sqrt(252), abs=5e-7)
     
     def test_calculate_sharpe_ratio(self):
         """Test Sharpe ratio calculation."""
@@ -112,40 +135,32 @@ class TestRiskCalculationEngine(TestBase):
         self.assertLess(sharpe, 10)
         
         # Test with zero volatility
-        zero_returns = pd.Series([0.001] * 10)
-        sharpe_zero_vol = self.risk_engine.calculate_sharpe_ratio(zero_returns, risk_free_rate=0.02)
+        sharpe_zero_vol = self.risk_engine.calculate_sharpe_ratio(_ZERO_RETURNS, risk_free_rate=0.02)
         self.assertGreater(sharpe_zero_vol, 0)  # Should be positive since returns > risk-free rate
     
     def test_calculate_max_drawdown(self):
         """Test maximum drawdown calculation."""
-        # Create returns with known drawdown
-        returns_with_drawdown = pd.Series([0.1, -0.05, -0.1, -0.05, 0.15, 0.05])
-        max_dd = self.risk_engine.calculate_max_drawdown(returns_with_drawdown)
+        # Returns with known drawdown
+        max_dd = self.risk_engine.calculate_max_drawdown(self.returns_with_drawdown)
         
         self.assertGreater(max_dd, 0)
         self.assertLessEqual(max_dd, 1)  # Cannot be more than 100%
     
     def test_calculate_beta(self):
         """Test beta calculation."""
-        portfolio_returns = pd.Series([0.01, -0.02, 0.015, -0.01, 0.02])
-        market_returns = pd.Series([0.008, -0.015, 0.012, -0.008, 0.018])
-        
-        beta = self.risk_engine.calculate_beta(portfolio_returns, market_returns)
+        beta = self.risk_engine.calculate_beta(self.portfolio_returns, self.market_returns)
         
         # Beta should be reasonable
         self.assertGreater(beta, -5)
         self.assertLess(beta, 5)
         
         # Test with identical series (beta should be 1)
-        beta_identical = self.risk_engine.calculate_beta(market_returns, market_returns)
-        self.assertAlmostEqual(beta_identical, 1.0, places=2)
+        beta_identical = self.risk_engine.calculate_beta(self.market_returns, self.market_returns)
+        assert beta_identical == pytest.approx(1.0, abs=5e-3)
     
     def test_calculate_alpha(self):
         """Test alpha calculation."""
-        portfolio_returns = pd.Series([0.01, -0.02, 0.015, -0.01, 0.02])
-        market_returns = pd.Series([0.008, -0.015, 0.012, -0.008, 0.018])
-        
-        alpha = self.risk_engine.calculate_alpha(portfolio_returns, market_returns)
+        alpha = self.risk_engine.calculate_alpha(self.portfolio_returns, self.market_returns)
         
         # Alpha should be reasonable
         self.assertGreater(alpha, -1)
@@ -153,24 +168,18 @@ class TestRiskCalculationEngine(TestBase):
     
     def test_calculate_tracking_error(self):
         """Test tracking error calculation."""
-        portfolio_returns = pd.Series([0.01, -0.02, 0.015, -0.01, 0.02])
-        benchmark_returns = pd.Series([0.008, -0.015, 0.012, -0.008, 0.018])
-        
-        tracking_error = self.risk_engine.calculate_tracking_error(portfolio_returns, benchmark_returns)
+        tracking_error = self.risk_engine.calculate_tracking_error(self.portfolio_returns, self.market_returns)
         
         self.assertGreaterEqual(tracking_error, 0)
         self.assertLess(tracking_error, 1)
         
         # Tracking error with identical series should be 0
-        te_identical = self.risk_engine.calculate_tracking_error(benchmark_returns, benchmark_returns)
-        self.assertAlmostEqual(te_identical, 0.0, places=6)
+        te_identical = self.risk_engine.calculate_tracking_error(self.market_returns, self.market_returns)
+        assert te_identical == pytest.approx(0.0, abs=5e-7)
     
     def test_calculate_information_ratio(self):
         """Test information ratio calculation."""
-        portfolio_returns = pd.Series([0.01, -0.02, 0.015, -0.01, 0.02])
-        benchmark_returns = pd.Series([0.008, -0.015, 0.012, -0.008, 0.018])
-        
-        info_ratio = self.risk_engine.calculate_information_ratio(portfolio_returns, benchmark_returns)
+        info_ratio = self.risk_engine.calculate_information_ratio(self.portfolio_returns, self.market_returns)
         
         # Information ratio should be reasonable
         self.assertGreater(info_ratio, -10)
@@ -191,6 +200,16 @@ class TestRiskCalculationEngine(TestBase):
             self.assertGreater(portfolio_returns.abs().max(), 0)
             self.assertLess(portfolio_returns.abs().max(), 1)  # Less than 100% daily return
     
+    def test_calculate_portfolio_returns_from_price_matrix(self):
+        """Test a pre-pivoted price matrix gives the same returns as long data."""
+        price_matrix = self.sample_prices.pivot(index='trading_date', columns='symbol', values='close_price')
+        price_matrix.index = pd.to_datetime(price_matrix.index)
+        
+        long_returns = self.risk_engine.calculate_portfolio_returns(self.sample_positions, self.sample_prices)
+        matrix_returns = self.risk_engine.calculate_portfolio_returns(self.sample_positions, price_matrix)
+        
+        np.testing.assert_allclose(matrix_returns.values, long_returns.values)
+    
     def test_calculate_all_risk_metrics(self):
         """Test comprehensive risk metrics calculation."""
         results = self.risk_engine.calculate_all_risk_metrics(
@@ -210,6 +229,20 @@ class TestRiskCalculationEngine(TestBase):
         self.assertGreaterEqual(results.volatility, 0)
         self.assertGreaterEqual(results.max_drawdown, 0)
         self.assertLessEqual(results.max_drawdown, 1)
+        
+        # The fused computation must agree with the individual metric methods
+        portfolio_returns = self.risk_engine.calculate_portfolio_returns(self.sample_positions, self.sample_prices)
+        np.testing.assert_allclose(
+            [results.var_95, results.var_99, results.expected_shortfall,
+             results.volatility, results.sharpe_ratio, results.max_drawdown],
+            [self.risk_engine.calculate_var(portfolio_returns, 0.95),
+             self.risk_engine.calculate_var(portfolio_returns, 0.99),
+             self.risk_engine.calculate_expected_shortfall(portfolio_returns, 0.95),
+             self.risk_engine.calculate_volatility(portfolio_returns),
+             self.risk_engine.calculate_sharpe_ratio(portfolio_returns),
+             self.risk_engine.calculate_max_drawdown(portfolio_returns)],
+            rtol=1e-9, atol=1e-12
+        )
     
     def test_stress_test(self):
         """Test stress testing functionality."""
@@ -279,8 +312,8 @@ class TestRiskResultsDataClass(TestBase):
         )
         
         self.assertEqual(results.portfolio_id, 'TEST_001')
-        self.assertAlmostEqual(results.var_95, 0.025)
-        self.assertAlmostEqual(results.sharpe_ratio, 1.35)
+        assert results.var_95 == pytest.approx(0.025, abs=5e-8)
+        assert results.sharpe_ratio == pytest.approx(1.35, abs=5e-8)
     
     def test_risk_results_optional_fields(self):
         """Test optional fields in RiskResults."""
@@ -299,8 +332,8 @@ class TestRiskResultsDataClass(TestBase):
             information_ratio=0.5
         )
         
-        self.assertAlmostEqual(results.tracking_error, 0.08)
-        self.assertAlmostEqual(results.information_ratio, 0.5)
+        assert results.tracking_error == pytest.approx(0.08, abs=5e-8)
+        assert results.information_ratio == pytest.approx(0.5, abs=5e-8)
 
 
 if __name__ == "__main__":